@@ -9,10 +9,19 @@ import json
 import time
 import math
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Dict, List, Optional, Any
 import logging
 from dataclasses import dataclass, asdict
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,15 +47,107 @@ class FlightData:
     spi: bool
     position_source: int
 
+# Columnar flight snapshot for vectorized consumers (conflict detection).
+# lat/lon in degrees, alt in metres, vx/vy/vz in m/s (east/north/up), t in epoch seconds;
+# fields missing from the feed are NaN
+FLIGHT_DTYPE = np.dtype([
+    ("icao", "U8"),
+    ("lat", "f4"),
+    ("lon", "f4"),
+    ("alt", "f4"),
+    ("vx", "f4"),
+    ("vy", "f4"),
+    ("vz", "f4"),
+    ("t", "f8")
+])
+
+# State vector indices: latitude, longitude, baro_altitude, velocity,
+# true_track, vertical_rate, time_position
+_STATE_NUMERIC = itemgetter(6, 5, 7, 9, 10, 11, 3)
+
+def parse_states(states: List[list]) -> List[FlightData]:
+    """Build FlightData records from raw OpenSky state vectors"""
+    
+    flights = []
+    for state in states:
+        if len(state) >= 17:  # Ensure we have all required fields
+            flights.append(FlightData(
+                icao24=state[0] if state[0] else "UNKNOWN",
+                callsign=state[1].strip() if state[1] else "UNKNOWN",
+                origin_country=state[2] if state[2] else "UNKNOWN",
+                time_position=state[3] if state[3] else 0,
+                last_contact=state[4] if state[4] else 0,
+                longitude=state[5] if state[5] else 0.0,
+                latitude=state[6] if state[6] else 0.0,
+                baro_altitude=state[7] if state[7] else 0.0,
+                on_ground=state[8] if state[8] is not None else False,
+                velocity=state[9] if state[9] else 0.0,
+                true_track=state[10] if state[10] else 0.0,
+                vertical_rate=state[11] if state[11] else 0.0,
+                sensors=state[12] if state[12] else [],
+                geo_altitude=state[13] if state[13] else 0.0,
+                squawk=state[14] if state[14] else "UNKNOWN",
+                spi=state[15] if state[15] is not None else False,
+                position_source=state[16] if state[16] else 0
+            ))
+    return flights
+
+def states_to_array(states: List[list]) -> np.ndarray:
+    """Convert raw OpenSky state vectors straight to a ``FLIGHT_DTYPE`` array
+    
+    Skips FlightData construction: the numeric columns are gathered with one
+    C-level itemgetter pass and converted in a single float64 cast, where
+    NumPy maps missing (None) values to NaN.
+    """
+    
+    states = [state for state in states if len(state) >= 17]
+    arr = np.empty(len(states), dtype=FLIGHT_DTYPE)
+    if not states:
+        return arr
+    
+    numeric = np.array(list(map(_STATE_NUMERIC, states)), dtype=np.float64)
+    lat, lon, alt, speed, track, vz, t = numeric.T
+    track = np.radians(track)
+    
+    arr["icao"] = [state[0] or "UNKNOWN" for state in states]
+    arr["lat"] = lat
+    arr["lon"] = lon
+    arr["alt"] = alt
+    arr["vx"] = speed * np.sin(track)
+    arr["vy"] = speed * np.cos(track)
+    arr["vz"] = vz
+    arr["t"] = t
+    return arr
+
+def decode_states(payload: bytes) -> List[list]:
+    """Extract the state vectors from a raw ``/states/all`` response body"""
+    
+    if not payload:
+        return []
+    data = orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+    return data.get("states") or []
+
+def parse_states_payload(payload: bytes) -> np.ndarray:
+    """Decode a raw ``/states/all`` response body straight to a ``FLIGHT_DTYPE`` array
+    
+    Module-level so it can run in a worker process.
+    """
+    
+    return states_to_array(decode_states(payload))
+
 class OpenSkyIntegration:
     """OpenSky Network API integration"""
     
-    def __init__(self, username: str = None, password: str = None):
+    def __init__(self, username: str = None, password: str = None,
+                 session: Optional[requests.Session] = None):
         self.base_url = "https://opensky-network.org/api"
         self.username = username
         self.password = password
         self.rate_limit_delay = 6  # 10 requests per minute = 6 seconds delay
         
+        # Keep-alive session; may be shared with other integrations
+        self.session = session if session is not None else requests.Session()
+        
         # API endpoints
         self.endpoints = {
             "all_states": "/states/all",
@@ -62,80 +163,82 @@ class OpenSkyIntegration:
     def get_all_flights(self, bbox: Optional[Dict[str, float]] = None) -> List[FlightData]:
         """Get all flights in the system or within bounding box"""
         
+        flights = parse_states(self.get_states(bbox))
+        logger.info(f"Retrieved {len(flights)} flights from OpenSky")
+        return flights
+    
+    def get_states(self, bbox: Optional[Dict[str, float]] = None) -> List[list]:
+        """Get raw state vectors for all flights or those within bounding box"""
+        
         try:
-            url = f"{self.base_url}{self.endpoints['all_states']}"
-            
-            # Add bounding box if provided (min_lon, max_lon, min_lat, max_lat)
-            if bbox:
-                params = {
-                    "lamin": bbox["min_lat"],
-                    "lomin": bbox["min_lon"],
-                    "lamax": bbox["max_lat"],
-                    "lomax": bbox["max_lon"]
-                }
-            else:
-                params = {}
-            
-            # Add authentication if available
-            auth = None
-            if self.username and self.password:
-                auth = (self.username, self.password)
-            
-            response = requests.get(url, params=params, auth=auth, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if "states" not in data:
-                logger.warning("No flight states in response")
-                return []
-            
-            flights = []
-            for state in data["states"]:
-                if len(state) >= 17:  # Ensure we have all required fields
-                    flight = FlightData(
-                        icao24=state[0] if state[0] else "UNKNOWN",
-                        callsign=state[1].strip() if state[1] else "UNKNOWN",
-                        origin_country=state[2] if state[2] else "UNKNOWN",
-                        time_position=state[3] if state[3] else 0,
-                        last_contact=state[4] if state[4] else 0,
-                        longitude=state[5] if state[5] else 0.0,
-                        latitude=state[6] if state[6] else 0.0,
-                        baro_altitude=state[7] if state[7] else 0.0,
-                        on_ground=state[8] if state[8] is not None else False,
-                        velocity=state[9] if state[9] else 0.0,
-                        true_track=state[10] if state[10] else 0.0,
-                        vertical_rate=state[11] if state[11] else 0.0,
-                        sensors=state[12] if state[12] else [],
-                        geo_altitude=state[13] if state[13] else 0.0,
-                        squawk=state[14] if state[14] else "UNKNOWN",
-                        spi=state[15] if state[15] is not None else False,
-                        position_source=state[16] if state[16] else 0
-                    )
-                    flights.append(flight)
-            
-            logger.info(f"Retrieved {len(flights)} flights from OpenSky")
-            return flights
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching flights from OpenSky: {e}")
-            return []
+            states = decode_states(self.get_states_payload(bbox))
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             return []
+        
+        if not states:
+            logger.warning("No flight states in response")
+        return states
+    
+    def get_states_payload(self, bbox: Optional[Dict[str, float]] = None) -> bytes:
+        """Get the undecoded ``/states/all`` response body (empty on failure)"""
+        
+        try:
+            return self.fetch_states_payload(bbox)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching flights from OpenSky: {e}")
+            return b""
+    
+    def fetch_states_payload(self, bbox: Optional[Dict[str, float]] = None) -> bytes:
+        """Get the undecoded ``/states/all`` response body
+        
+        Raises ``requests.exceptions.RequestException`` on transport or HTTP
+        failure, so callers can tell an outage from an empty sky.
+        """
+        
+        url = f"{self.base_url}{self.endpoints['all_states']}"
+        
+        # Add bounding box if provided (min_lon, max_lon, min_lat, max_lat)
+        if bbox:
+            params = {
+                "lamin": bbox["min_lat"],
+                "lomin": bbox["min_lon"],
+                "lamax": bbox["max_lat"],
+                "lomax": bbox["max_lon"]
+            }
+        else:
+            params = {}
+        
+        # Add authentication if available
+        auth = None
+        if self.username and self.password:
+            auth = (self.username, self.password)
+        
+        response = self.session.get(url, params=params, auth=auth, timeout=10)
+        response.raise_for_status()
+        
+        return response.content
     
     def get_flights_by_area(self, min_lat: float, max_lat: float, 
                            min_lon: float, max_lon: float) -> List[FlightData]:
         """Get flights within specific geographic area"""
         
-        bbox = {
+        return self.get_all_flights(self._bbox(min_lat, max_lat, min_lon, max_lon))
+    
+    def get_flight_array_by_area(self, min_lat: float, max_lat: float,
+                                 min_lon: float, max_lon: float) -> np.ndarray:
+        """Get flights within an area as a ``FLIGHT_DTYPE`` structured array"""
+        
+        return states_to_array(self.get_states(self._bbox(min_lat, max_lat, min_lon, max_lon)))
+    
+    @staticmethod
+    def _bbox(min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> Dict[str, float]:
+        return {
             "min_lat": min_lat,
             "max_lat": max_lat,
             "min_lon": min_lon,
             "max_lon": max_lon
         }
-        
-        return self.get_all_flights(bbox)
     
     def get_flights_by_airport(self, airport_lat: float, airport_lon: float, 
                               radius_km: float = 50) -> List[FlightData]:
@@ -167,7 +270,7 @@ class OpenSkyIntegration:
             if self.username and self.password:
                 auth = (self.username, self.password)
             
-            response = requests.get(url, params=params, auth=auth, timeout=10)
+            response = self.session.get(url, params=params, auth=auth, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -207,7 +310,7 @@ class OpenSkyIntegration:
             if self.username and self.password:
                 auth = (self.username, self.password)
             
-            response = requests.get(url, params=params, auth=auth, timeout=10)
+            response = self.session.get(url, params=params, auth=auth, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -240,7 +343,7 @@ class OpenSkyIntegration:
             if self.username and self.password:
                 auth = (self.username, self.password)
             
-            response = requests.get(url, params=params, auth=auth, timeout=10)
+            response = self.session.get(url, params=params, auth=auth, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -270,7 +373,7 @@ class OpenSkyIntegration:
             if self.username and self.password:
                 auth = (self.username, self.password)
             
-            response = requests.get(url, params=params, auth=auth, timeout=10)
+            response = self.session.get(url, params=params, auth=auth, timeout=10)
             response.raise_for_status()
             
             data = response.json()
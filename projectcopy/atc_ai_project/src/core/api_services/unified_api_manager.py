@@ -6,24 +6,122 @@ Centralized management of all real-time APIs
 
 import asyncio
 import json
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import pickle
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable, Tuple
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 import threading
-from queue import Queue
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson >= 3.9 can splice pre-encoded JSON into a document
+ORJSON_FRAGMENT_AVAILABLE = ORJSON_AVAILABLE and hasattr(orjson, "Fragment")
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 # Import our API integrations
-from .opensky_integration import OpenSkyIntegration, FlightData
-from .openweathermap_integration import OpenWeatherMapIntegration, WeatherData
+from .opensky_integration import (
+    OpenSkyIntegration, FlightData, FLIGHT_DTYPE, decode_states, parse_states, parse_states_payload
+)
+from .openweathermap_integration import (
+    OpenWeatherMapIntegration, WeatherData, TokenBucket, ResponseCache, DEFAULT_CACHE_PATH
+)
 from .faa_integration import FAAIntegration, AirportStatus
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+DEFAULT_API_CACHE_PATH = DEFAULT_CACHE_PATH.with_name("api_manager.sqlite")
+
+# Major US cities polled for weather
+_CITIES: Tuple[Tuple[float, float, str], ...] = (
+    (40.7128, -74.0060, "New York"),
+    (34.0522, -118.2437, "Los Angeles"),
+    (41.8781, -87.6298, "Chicago"),
+    (32.7767, -96.7970, "Dallas"),
+    (33.7490, -84.3880, "Atlanta")
+)
+
+# Major US airports polled for status
+_AIRPORTS: Tuple[str, ...] = ("JFK", "LAX", "ORD", "DFW", "ATL", "DEN", "SFO", "SEA")
+
+# Returned by _load_cached for an entry that no longer unpickles
+_UNREADABLE = object()
+
+# Tiles covering major US airspace (min_lat, max_lat, min_lon, max_lon); fetched
+# concurrently so each response stays small enough to parse in parallel
+_FLIGHT_TILES: Tuple[Tuple[float, float, float, float], ...] = (
+    (25.0, 37.0, -125.0, -95.0),
+    (25.0, 37.0, -95.0, -66.0),
+    (37.0, 49.0, -125.0, -95.0),
+    (37.0, 49.0, -95.0, -66.0)
+)
+
+def _weather_cache_key(lat: float, lon: float) -> str:
+    return f"wx:{lat}:{lon}"
+
+_CITY_CACHE_KEYS: Dict[Tuple[float, float], str] = {
+    (lat, lon): _weather_cache_key(lat, lon) for lat, lon, _ in _CITIES
+}
+
+def flights_to_array(flights: List[FlightData]) -> np.ndarray:
+    """Convert flights to a ``FLIGHT_DTYPE`` structured array"""
+    
+    # Ground speed and track are loaded into vx/vy, then resolved into components
+    arr = np.fromiter(
+        ((f.icao24, f.latitude, f.longitude, f.baro_altitude,
+          f.velocity, f.true_track, f.vertical_rate, f.time_position) for f in flights),
+        dtype=FLIGHT_DTYPE,
+        count=len(flights)
+    )
+    speed = arr["vx"].copy()
+    track = np.radians(arr["vy"])
+    arr["vx"] = speed * np.sin(track)
+    arr["vy"] = speed * np.cos(track)
+    return arr
+
+def _slotted(cls):
+    """Rebuild a dataclass with ``__slots__`` for its fields, as ``dataclass(slots=True)``
+    does on Python 3.10+"""
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names + ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    namespace['__qualname__'] = cls.__qualname__
+    
+    # Frozen instances cannot restore slot state through __setattr__ when unpickled
+    if cls.__dataclass_params__.frozen:
+        def __getstate__(self):
+            return [getattr(self, name) for name in names]
+        
+        def __setstate__(self, state):
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+        
+        namespace['__getstate__'] = __getstate__
+        namespace['__setstate__'] = __setstate__
+    
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@_slotted
+@dataclass(frozen=True)
 class APIConfig:
     """API configuration"""
     service_name: str
@@ -35,7 +133,8 @@ class APIConfig:
     max_retries: int = 3
     timeout: int = 10
 
-@dataclass
+@_slotted
+@dataclass(frozen=True)
 class SystemStatus:
     """Overall system status"""
     timestamp: datetime
@@ -51,7 +150,33 @@ class SystemStatus:
 class UnifiedAPIManager:
     """Unified API management system"""
     
-    def __init__(self):
+    # Seconds a fetched result is reused before asking the upstream again
+    CACHE_TTL = {
+        "opensky": 15,
+        "openweathermap": 30,
+        "faa": 60
+    }
+    
+    # Requests allowed in flight at once per API during background updates
+    API_CONCURRENCY = {
+        "opensky": len(_FLIGHT_TILES),
+        "openweathermap": 10,
+        "faa": 5
+    }
+    
+    # Combined OpenSky payload size above which tiles are decoded in worker
+    # processes; smaller snapshots are cheaper to parse than to ship over IPC
+    PARSE_IN_PROCESS_MIN_BYTES = 512 * 1024
+    
+    # Upper bound (seconds) for the background loop's delay after repeated failures
+    MAX_UPDATE_BACKOFF = 600
+    
+    # Seconds an update callback may take, and consecutive failures/timeouts
+    # tolerated before it is unsubscribed
+    CALLBACK_TIMEOUT = 1.0
+    MAX_CALLBACK_FAILURES = 3
+    
+    def __init__(self, cache_path: Optional[Path] = DEFAULT_API_CACHE_PATH):
         # API configurations
         self.api_configs = {
             "opensky": APIConfig(
@@ -81,196 +206,549 @@ class UnifiedAPIManager:
             "faa": None
         }
         
+        # Guards api_configs against configure_api racing initialize_apis
+        self._config_lock = threading.RLock()
+        
+        # Per-API token buckets; only wait when the quota is actually spent
+        self._rate_limiters: Dict[str, TokenBucket] = {}
+        self._build_rate_limiters()
+        
+        # Per-API concurrency limits, created lazily on the loop that uses them
+        self._api_sem: Dict[str, asyncio.Semaphore] = {}
+        self._api_sem_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Pooled keep-alive session shared by all integrations
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # Multiplexed HTTP/2 client for hosts hit with concurrent fan-outs (weather)
+        self._http2_client = self._create_http2_client()
+        
+        # Disk-backed result cache shared across restarts
+        self._cache = None
+        if cache_path is not None:
+            try:
+                self._cache = ResponseCache(cache_path)
+            except Exception as e:
+                logger.warning(f"API result cache unavailable ({e}) - continuing without it")
+        
+        # Fetches currently running, so identical concurrent lookups share one request
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
         # Data storage
-        self.flight_data: List[FlightData] = []
+        # Flights are held as raw per-tile response bodies plus a columnar array;
+        # FlightData records are only built when flight_data is read
+        self._flight_payloads: Tuple[bytes, ...] = ()
+        self._flight_data: Optional[List[FlightData]] = []
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.flight_array: np.ndarray = np.empty(0, dtype=FLIGHT_DTYPE)
         self.weather_data: Dict[str, WeatherData] = {}
         self.airport_status: Dict[str, AirportStatus] = {}
         
-        # Performance metrics
+        # Time of the last completed update cycle, stamped once per cycle so
+        # status/export reads don't allocate a fresh datetime each call
+        self._last_update = datetime.now()
+        self._last_update_iso = self._last_update.isoformat()
+        
+        # Performance metrics; updated from the update loop and caller threads
+        self._metrics_lock = threading.Lock()
         self.metrics = {
             "total_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
             "data_points_collected": 0,
-            "last_update": datetime.now()
+            "last_update": self._last_update
         }
         
+        # Encoded export fragments per slot, reused while the slot holds the same object
+        self._export_fragments: Dict[str, Tuple[Any, Any]] = {}
+        
         # Data update callbacks
         self.update_callbacks: List[Callable] = []
+        self._callback_failures: Dict[Callable, int] = {}
+        # Callbacks receiving only the slice that changed, as results arrive
+        self.partial_update_callbacks: List[Callable] = []
         
-        # Background update thread
-        self.update_thread = None
+        # Background update task (or thread hosting its event loop)
+        self.update_task: Optional[asyncio.Task] = None
+        self.update_thread: Optional[threading.Thread] = None
         self.running = False
         
         logger.info("Unified API Manager initialized")
     
+    @property
+    def flight_data(self) -> List[FlightData]:
+        """Latest flights as FlightData records"""
+        
+        if self._flight_data is None:
+            # Aircraft on a tile border can appear in two tiles
+            seen = set()
+            flights = []
+            for payload in self._flight_payloads:
+                for flight in parse_states(decode_states(payload)):
+                    if flight.icao24 not in seen:
+                        seen.add(flight.icao24)
+                        flights.append(flight)
+            self._flight_data = flights
+        return self._flight_data
+    
+    @flight_data.setter
+    def flight_data(self, flights: List[FlightData]):
+        self._flight_payloads = ()
+        self._flight_data = flights
+        self.flight_array = flights_to_array(flights)
+    
     def configure_api(self, api_name: str, config: APIConfig):
         """Configure specific API"""
         
-        if api_name in self.api_configs:
-            self.api_configs[api_name] = config
-            logger.info(f"Configured {api_name} API")
-        else:
-            logger.warning(f"Unknown API: {api_name}")
+        with self._config_lock:
+            if api_name in self.api_configs:
+                self.api_configs[api_name] = config
+                logger.info(f"Configured {api_name} API")
+            else:
+                logger.warning(f"Unknown API: {api_name}")
     
-    def initialize_apis(self):
-        """Initialize all enabled APIs"""
+    def _build_rate_limiters(self):
+        """Create one token bucket per API from its configured minimum request spacing"""
         
-        # Initialize OpenSky
-        if self.api_configs["opensky"].enabled:
-            config = self.api_configs["opensky"]
-            self.apis["opensky"] = OpenSkyIntegration(
-                username=config.username,
-                password=config.password
-            )
-            logger.info("OpenSky API initialized")
+        limiters = {}
+        with self._config_lock:
+            for api_name, config in self.api_configs.items():
+                rate = 1.0 / config.rate_limit_delay if config.rate_limit_delay > 0 else 1e9
+                limiters[api_name] = TokenBucket(rate=rate, capacity=1)
+        # Swap in whole so in-flight fetches never see a half-built set
+        self._rate_limiters = limiters
+    
+    def _semaphore(self, api_name: str) -> asyncio.Semaphore:
+        """Concurrency limit for an API, bound to the running event loop"""
+        
+        loop = asyncio.get_running_loop()
+        if loop is not self._api_sem_loop:
+            self._api_sem = {
+                name: asyncio.Semaphore(limit) for name, limit in self.API_CONCURRENCY.items()
+            }
+            self._api_sem_loop = loop
+        return self._api_sem[api_name]
+    
+    async def _run_bounded(self, api_name: str, fetch: Callable, *args) -> Any:
+        """Run a blocking fetch in a worker thread while holding the API's concurrency slot"""
+        
+        async with self._semaphore(api_name):
+            return await asyncio.to_thread(fetch, *args)
+    
+    @staticmethod
+    def _create_http2_client():
+        """Shared HTTP/2 client, or None when httpx/h2 are not installed"""
         
-        # Initialize OpenWeatherMap
-        if self.api_configs["openweathermap"].enabled:
-            config = self.api_configs["openweathermap"]
-            self.apis["openweathermap"] = OpenWeatherMapIntegration(
-                api_key=config.api_key
+        if not HTTPX_AVAILABLE:
+            return None
+        try:
+            return httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
             )
-            logger.info("OpenWeatherMap API initialized")
+        except ImportError:
+            logger.warning("h2 package not installed - weather requests use HTTP/1.1")
+            return None
+    
+    def _count(self, metric: str, amount: int = 1):
+        """Increment a metric counter"""
+        
+        with self._metrics_lock:
+            self.metrics[metric] += amount
+    
+    def _metrics_snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the metrics"""
+        
+        with self._metrics_lock:
+            return dict(self.metrics)
+    
+    def _coalesced(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Run ``fetch`` unless an identical fetch is already in flight, then share its result
+        
+        Callers may be worker threads of the update loop or synchronous callers,
+        so waiting is done on a concurrent.futures.Future.
+        """
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
         
-        # Initialize FAA
-        if self.api_configs["faa"].enabled:
-            self.apis["faa"] = FAAIntegration()
-            logger.info("FAA API initialized")
+        if not owner:
+            return future.result()
+        
+        try:
+            value = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return a fresh cached result for ``key`` or fetch and store one
+        
+        Concurrent misses for the same key share a single fetch. ``fetch``
+        must raise on failure rather than return placeholder data: only what
+        it returns is cached, and when it raises the last cached result (even
+        if expired) is served instead so a flaky upstream doesn't blank the data.
+        """
+        
+        if self._cache is None:
+            return self._coalesced(key, fetch)
+        
+        body = self._cache.get(key)
+        if body is not None:
+            value = self._load_cached(key, body)
+            if value is not _UNREADABLE:
+                return value
+        
+        try:
+            value = self._coalesced(key, fetch)
+        except Exception:
+            stale = self._cache.get(key, allow_stale=True)
+            if stale is None:
+                raise
+            value = self._load_cached(key, stale)
+            if value is _UNREADABLE:
+                raise
+            logger.warning(f"Serving stale cached result for {key}")
+            return value
+        
+        if value is not None:
+            self._cache.set(key, pickle.dumps(value), ttl)
+        return value
+    
+    def _load_cached(self, key: str, body: bytes) -> Any:
+        """Unpickle a cached result, evicting it and returning ``_UNREADABLE`` if it
+        is truncated or was pickled from an older shape of its class"""
+        
+        try:
+            return pickle.loads(body)
+        except Exception as e:
+            logger.warning(f"Evicting unreadable cached result for {key}: {e}")
+            self._cache.delete(key)
+            return _UNREADABLE
+    
+    def initialize_apis(self):
+        """Initialize all enabled APIs"""
+        
+        # Hold the config lock so a concurrent configure_api can't interleave
+        with self._config_lock:
+            self._build_rate_limiters()
+            
+            # Initialize OpenSky
+            if self.api_configs["opensky"].enabled:
+                config = self.api_configs["opensky"]
+                self.apis["opensky"] = OpenSkyIntegration(
+                    username=config.username,
+                    password=config.password,
+                    session=self._session
+                )
+                logger.info("OpenSky API initialized")
+            
+            # Initialize OpenWeatherMap
+            if self.api_configs["openweathermap"].enabled:
+                config = self.api_configs["openweathermap"]
+                self.apis["openweathermap"] = OpenWeatherMapIntegration(
+                    api_key=config.api_key,
+                    session=self._http2_client or self._session,
+                    rate_limiter=self._rate_limiters["openweathermap"]
+                )
+                logger.info("OpenWeatherMap API initialized")
+            
+            # Initialize FAA
+            if self.api_configs["faa"].enabled:
+                self.apis["faa"] = FAAIntegration()
+                logger.info("FAA API initialized")
     
     def start_background_updates(self, update_interval: int = 60):
-        """Start background data updates"""
+        """Start background data updates
         
-        if self.update_thread and self.update_thread.is_alive():
+        Runs as a task on the caller's event loop when there is one; synchronous
+        callers get the loop hosted on a daemon thread.
+        """
+        
+        if (self.update_task and not self.update_task.done()) or \
+                (self.update_thread and self.update_thread.is_alive()):
             logger.warning("Background updates already running")
             return
         
         self.running = True
-        self.update_thread = threading.Thread(
-            target=self._background_update_loop,
-            args=(update_interval,),
-            daemon=True
-        )
-        self.update_thread.start()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            self.update_task = loop.create_task(self._background_update_loop(update_interval))
+        else:
+            self.update_thread = threading.Thread(
+                target=self._host_update_loop,
+                args=(update_interval,),
+                daemon=True
+            )
+            self.update_thread.start()
         logger.info(f"Started background updates every {update_interval} seconds")
     
+    def _host_update_loop(self, update_interval: int):
+        """Thread target: run the update loop as a task on a private event loop"""
+        
+        async def run():
+            self.update_task = asyncio.current_task()
+            await self._background_update_loop(update_interval)
+        
+        # Worker threads may be parked in a rate-limiter wait; don't block shutdown on them
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(thread_name_prefix="api-update")
+        loop.set_default_executor(executor)
+        try:
+            loop.run_until_complete(run())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            loop.close()
+    
     def stop_background_updates(self):
-        """Stop background data updates"""
+        """Stop background data updates
+        
+        The update task is cancelled on its own loop, so a loop hosted on the
+        helper thread stops immediately instead of finishing its sleep.
+        """
         
         self.running = False
+        task, self.update_task = self.update_task, None
+        if task and not task.done():
+            task.get_loop().call_soon_threadsafe(task.cancel)
         if self.update_thread:
             self.update_thread.join(timeout=5)
+            self.update_thread = None
         logger.info("Stopped background updates")
     
-    def _background_update_loop(self, update_interval: int):
-        """Background update loop"""
+    def close(self):
+        """Stop background updates and release pooled connections"""
+        
+        self.stop_background_updates()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
+            self._parse_pool = None
+        self._session.close()
+        if self._http2_client is not None:
+            self._http2_client.close()
+        logger.info("Unified API Manager closed")
+    
+    async def _background_update_loop(self, update_interval: int):
+        """Background update loop
         
+        Cycles start every ``update_interval`` seconds on the monotonic clock
+        (the fetch time is not added on top); after a failed cycle the delay
+        doubles, up to MAX_UPDATE_BACKOFF, until a cycle succeeds again.
+        """
+        
+        delay = update_interval
         while self.running:
+            started = time.monotonic()
             try:
-                self.update_all_data()
-                time.sleep(update_interval)
+                await self.update_all_data()
+                delay = update_interval
             except Exception as e:
-                logger.error(f"Error in background update: {e}")
-                time.sleep(update_interval)
+                delay = min(delay * 2, self.MAX_UPDATE_BACKOFF)
+                logger.error(f"Error in background update: {e} - next attempt in {delay}s")
+            await asyncio.sleep(max(0.0, delay - (time.monotonic() - started)))
     
-    def update_all_data(self):
-        """Update all data from all APIs"""
+    async def update_all_data(self):
+        """Update all data from all APIs, fetching from each API concurrently"""
         
         logger.info("Updating all data...")
         
-        # Update flight data
+        updates = []
         if self.apis["opensky"]:
-            self._update_flight_data()
-        
-        # Update weather data
+            updates.append(self._update_flight_data())
         if self.apis["openweathermap"]:
-            self._update_weather_data()
-        
-        # Update airport status
+            updates.append(self._update_weather_data())
         if self.apis["faa"]:
-            self._update_airport_status()
+            updates.append(self._update_airport_status())
+        await asyncio.gather(*updates)
+        
+        self._last_update = datetime.now()
+        self._last_update_iso = self._last_update.isoformat()
+        with self._metrics_lock:
+            self.metrics["last_update"] = self._last_update
         
         # Notify callbacks
-        self._notify_callbacks()
+        await self._notify_callbacks()
         
         logger.info("Data update completed")
     
-    def _update_flight_data(self):
+    async def _update_flight_data(self):
         """Update flight data from OpenSky"""
         
         try:
-            config = self.api_configs["opensky"]
-            time.sleep(config.rate_limit_delay)
-            
-            # Get flights in major US airspace
-            flights = self.apis["opensky"].get_flights_by_area(
-                min_lat=25.0, max_lat=49.0,
-                min_lon=-125.0, max_lon=-66.0
+            # Get flights in major US airspace, one request per tile
+            payloads = await asyncio.gather(
+                *(self._run_bounded("opensky", self._fetch_states_payload, *tile)
+                  for tile in _FLIGHT_TILES)
             )
             
-            self.flight_data = flights
-            self.metrics["successful_requests"] += 1
-            self.metrics["data_points_collected"] += len(flights)
+            self.flight_array = await self._parse_flight_payloads(payloads)
+            self._flight_payloads = tuple(payloads)
+            self._flight_data = None
+            self._count("successful_requests")
+            self._count("data_points_collected", len(self.flight_array))
             
-            logger.info(f"Updated {len(flights)} flight records")
+            logger.info(f"Updated {len(self.flight_array)} flight records")
             
         except Exception as e:
             logger.error(f"Error updating flight data: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
     
-    def _update_weather_data(self):
+    async def _update_weather_data(self):
         """Update weather data from OpenWeatherMap"""
         
         try:
-            config = self.api_configs["openweathermap"]
-            time.sleep(config.rate_limit_delay)
-            
-            # Major US cities for weather data
-            cities = [
-                (40.7128, -74.0060, "New York"),
-                (34.0522, -118.2437, "Los Angeles"),
-                (41.8781, -87.6298, "Chicago"),
-                (32.7767, -96.7970, "Dallas"),
-                (33.7490, -84.3880, "Atlanta")
-            ]
-            
-            for lat, lon, city in cities:
-                weather = self.apis["openweathermap"].get_current_weather(lat, lon)
+            # Publish each city as soon as it arrives rather than after the slowest
+            for next_done in asyncio.as_completed([
+                self._update_city_weather(lat, lon, city) for lat, lon, city in _CITIES
+            ]):
+                city, weather = await next_done
                 if weather:
                     self.weather_data[city] = weather
+                    self._notify_callbacks_partial({"weather_data": {city: weather}})
             
-            self.metrics["successful_requests"] += 1
-            self.metrics["data_points_collected"] += len(self.weather_data)
+            self._count("successful_requests")
+            self._count("data_points_collected", len(self.weather_data))
             
             logger.info(f"Updated weather for {len(self.weather_data)} cities")
             
         except Exception as e:
             logger.error(f"Error updating weather data: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
     
-    def _update_airport_status(self):
+    async def _update_airport_status(self):
         """Update airport status from FAA"""
         
         try:
-            config = self.api_configs["faa"]
-            time.sleep(config.rate_limit_delay)
-            
-            # Major US airports
-            airports = ["JFK", "LAX", "ORD", "DFW", "ATL", "DEN", "SFO", "SEA"]
-            
-            for airport in airports:
-                status = self.apis["faa"].get_airport_status(airport)
+            for next_done in asyncio.as_completed([self._update_one_airport(airport) for airport in _AIRPORTS]):
+                airport, status = await next_done
                 if status:
                     self.airport_status[airport] = status
+                    self._notify_callbacks_partial({"airport_status": {airport: status}})
             
-            self.metrics["successful_requests"] += 1
-            self.metrics["data_points_collected"] += len(self.airport_status)
+            self._count("successful_requests")
+            self._count("data_points_collected", len(self.airport_status))
             
             logger.info(f"Updated status for {len(self.airport_status)} airports")
             
         except Exception as e:
             logger.error(f"Error updating airport status: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
+    
+    async def _update_city_weather(self, lat: float, lon: float,
+                                   city: str) -> Tuple[str, Optional[WeatherData]]:
+        """Fetch weather for one city; failures are logged and yield None"""
+        
+        try:
+            return city, await self._run_bounded("openweathermap", self._fetch_weather, lat, lon)
+        except Exception as e:
+            logger.error(f"Error updating weather for {city}: {e}")
+            return city, None
+    
+    async def _update_one_airport(self, airport: str) -> Tuple[str, Optional[AirportStatus]]:
+        """Fetch status for one airport; failures are logged and yield None"""
+        
+        try:
+            return airport, await self._run_bounded("faa", self._fetch_airport_status, airport)
+        except Exception as e:
+            logger.error(f"Error updating status for {airport}: {e}")
+            return airport, None
+    
+    def _fetch_flights(self, min_lat: float, max_lat: float,
+                       min_lon: float, max_lon: float) -> List[FlightData]:
+        """Flights in an area, via the result cache and rate limiter"""
+        
+        return parse_states(decode_states(self._fetch_states_payload(min_lat, max_lat, min_lon, max_lon)))
+    
+    async def _parse_flight_payloads(self, payloads: List[bytes]) -> np.ndarray:
+        """Decode per-tile OpenSky bodies into one de-duplicated ``FLIGHT_DTYPE`` array
+        
+        Large snapshots are decoded in worker processes, one tile each, so JSON
+        parsing isn't serialized on the GIL.
+        """
+        
+        arrays = None
+        if len(payloads) > 1 and sum(map(len, payloads)) >= self.PARSE_IN_PROCESS_MIN_BYTES:
+            try:
+                if self._parse_pool is None:
+                    self._parse_pool = ProcessPoolExecutor(max_workers=len(_FLIGHT_TILES))
+                loop = asyncio.get_running_loop()
+                arrays = await asyncio.gather(
+                    *(loop.run_in_executor(self._parse_pool, parse_states_payload, payload)
+                      for payload in payloads)
+                )
+            except Exception as e:
+                logger.warning(f"Parallel flight parsing failed ({e}) - parsing inline")
+                self._parse_pool = None
+        if arrays is None:
+            arrays = [parse_states_payload(payload) for payload in payloads]
+        
+        # Aircraft on a tile border can appear in two tiles
+        arr = np.concatenate(arrays)
+        _, first = np.unique(arr["icao"], return_index=True)
+        return arr[np.sort(first)]
+    
+    def _fetch_states_payload(self, min_lat: float, max_lat: float,
+                              min_lon: float, max_lon: float) -> bytes:
+        """Raw OpenSky response body for an area, via the result cache and rate limiter"""
+        
+        def fetch() -> bytes:
+            self._rate_limiters["opensky"].acquire()
+            return self.apis["opensky"].fetch_states_payload(
+                {"min_lat": min_lat, "max_lat": max_lat, "min_lon": min_lon, "max_lon": max_lon}
+            )
+        
+        return self._cached(
+            f"states:{min_lat}:{max_lat}:{min_lon}:{max_lon}", self.CACHE_TTL["opensky"], fetch
+        )
+    
+    def _fetch_weather(self, lat: float, lon: float) -> Optional[WeatherData]:
+        """Current weather for a location, via the result cache and rate limiter"""
+        
+        api = self.apis["openweathermap"]
+        if not api.api_key:
+            # Mock weather only; not worth caching
+            return api.get_current_weather(lat, lon)
+        
+        # The integration draws on the shared openweathermap limiter itself, and
+        # only when it actually goes to the network
+        def fetch() -> WeatherData:
+            return api.get_current_weather(lat, lon, use_mock=False)
+        
+        key = _CITY_CACHE_KEYS.get((lat, lon)) or _weather_cache_key(lat, lon)
+        return self._cached(key, self.CACHE_TTL["openweathermap"], fetch)
+    
+    def _fetch_airport_status(self, airport_code: str) -> Optional[AirportStatus]:
+        """Airport status, via the result cache and rate limiter"""
+        
+        def fetch() -> Optional[AirportStatus]:
+            self._rate_limiters["faa"].acquire()
+            return self.apis["faa"].get_airport_status(airport_code)
+        
+        return self._cached(f"airport:{airport_code}", self.CACHE_TTL["faa"], fetch)
     
     def get_flights_in_area(self, min_lat: float, max_lat: float, 
                            min_lon: float, max_lon: float) -> List[FlightData]:
@@ -280,17 +758,14 @@ class UnifiedAPIManager:
             return []
         
         try:
-            config = self.api_configs["opensky"]
-            time.sleep(config.rate_limit_delay)
-            
-            flights = self.apis["opensky"].get_flights_by_area(min_lat, max_lat, min_lon, max_lon)
-            self.metrics["successful_requests"] += 1
+            flights = self._fetch_flights(min_lat, max_lat, min_lon, max_lon)
+            self._count("successful_requests")
             
             return flights
             
         except Exception as e:
             logger.error(f"Error getting flights in area: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
             return []
     
     def get_weather_at_location(self, lat: float, lon: float) -> Optional[WeatherData]:
@@ -300,17 +775,14 @@ class UnifiedAPIManager:
             return None
         
         try:
-            config = self.api_configs["openweathermap"]
-            time.sleep(config.rate_limit_delay)
-            
-            weather = self.apis["openweathermap"].get_current_weather(lat, lon)
-            self.metrics["successful_requests"] += 1
+            weather = self._fetch_weather(lat, lon)
+            self._count("successful_requests")
             
             return weather
             
         except Exception as e:
             logger.error(f"Error getting weather: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
             return None
     
     def get_airport_status(self, airport_code: str) -> Optional[AirportStatus]:
@@ -320,17 +792,14 @@ class UnifiedAPIManager:
             return None
         
         try:
-            config = self.api_configs["faa"]
-            time.sleep(config.rate_limit_delay)
-            
-            status = self.apis["faa"].get_airport_status(airport_code)
-            self.metrics["successful_requests"] += 1
+            status = self._fetch_airport_status(airport_code)
+            self._count("successful_requests")
             
             return status
             
         except Exception as e:
             logger.error(f"Error getting airport status: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
             return None
     
     def get_aviation_weather(self, lat: float, lon: float) -> Dict[str, Any]:
@@ -340,31 +809,28 @@ class UnifiedAPIManager:
             return {}
         
         try:
-            config = self.api_configs["openweathermap"]
-            time.sleep(config.rate_limit_delay)
-            
             aviation_weather = self.apis["openweathermap"].get_aviation_weather(lat, lon)
-            self.metrics["successful_requests"] += 1
+            self._count("successful_requests")
             
             return aviation_weather
             
         except Exception as e:
             logger.error(f"Error getting aviation weather: {e}")
-            self.metrics["failed_requests"] += 1
+            self._count("failed_requests")
             return {}
     
     def get_system_overview(self) -> Dict[str, Any]:
         """Get comprehensive system overview"""
         
         overview = {
-            "timestamp": datetime.now(),
+            "timestamp": self._last_update,
             "apis": {},
             "data_summary": {
-                "total_flights": len(self.flight_data),
+                "total_flights": len(self.flight_array),
                 "weather_locations": len(self.weather_data),
                 "airports_tracked": len(self.airport_status)
             },
-            "metrics": self.metrics.copy()
+            "metrics": self._metrics_snapshot()
         }
         
         # Get individual API status
@@ -383,9 +849,10 @@ class UnifiedAPIManager:
         active_apis = sum(1 for api in self.apis.values() if api is not None)
         failed_apis = total_apis - active_apis
         
-        total_requests = self.metrics["total_requests"]
-        successful_requests = self.metrics["successful_requests"]
-        failed_requests = self.metrics["failed_requests"]
+        metrics = self._metrics_snapshot()
+        total_requests = metrics["total_requests"]
+        successful_requests = metrics["successful_requests"]
+        failed_requests = metrics["failed_requests"]
         
         # Calculate health score
         if total_requests == 0:
@@ -402,14 +869,14 @@ class UnifiedAPIManager:
                 health_score = "poor"
         
         return SystemStatus(
-            timestamp=datetime.now(),
+            timestamp=self._last_update,
             total_apis=total_apis,
             active_apis=active_apis,
             failed_apis=failed_apis,
             total_requests=total_requests,
             successful_requests=successful_requests,
             failed_requests=failed_requests,
-            data_points_collected=self.metrics["data_points_collected"],
+            data_points_collected=metrics["data_points_collected"],
             system_health=health_score
         )
     
@@ -424,26 +891,112 @@ class UnifiedAPIManager:
         
         if callback in self.update_callbacks:
             self.update_callbacks.remove(callback)
+            self._callback_failures.pop(callback, None)
             logger.info("Removed update callback")
     
-    def _notify_callbacks(self):
-        """Notify all callbacks of data update"""
+    def add_partial_update_callback(self, callback: Callable):
+        """Add callback receiving incremental updates
+        
+        Called with a dict holding only what changed, e.g.
+        ``{"weather_data": {"Chicago": WeatherData(...)}}``.
+        """
+        
+        self.partial_update_callbacks.append(callback)
+        logger.info("Added partial update callback")
+    
+    def remove_partial_update_callback(self, callback: Callable):
+        """Remove partial update callback"""
         
-        for callback in self.update_callbacks:
+        if callback in self.partial_update_callbacks:
+            self.partial_update_callbacks.remove(callback)
+            logger.info("Removed partial update callback")
+    
+    def _notify_callbacks_partial(self, delta: Dict[str, Any]):
+        """Notify partial update callbacks of a single changed slice"""
+        
+        for callback in self.partial_update_callbacks:
             try:
-                callback(self.get_system_overview())
+                callback(delta)
             except Exception as e:
-                logger.error(f"Error in callback: {e}")
+                logger.error(f"Error in partial update callback: {e}")
+    
+    async def _notify_callbacks(self):
+        """Notify all callbacks of data update
+        
+        Callbacks run concurrently, each limited to CALLBACK_TIMEOUT seconds;
+        one that fails or times out more than MAX_CALLBACK_FAILURES times in a
+        row is removed so it cannot stall the update loop.
+        """
+        
+        if not self.update_callbacks:
+            return
+        
+        # One overview per cycle, shared by every callback
+        overview = self.get_system_overview()
+        
+        async def run(callback: Callable):
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    pending = callback(overview)
+                else:
+                    pending = asyncio.to_thread(callback, overview)
+                await asyncio.wait_for(pending, timeout=self.CALLBACK_TIMEOUT)
+                self._callback_failures.pop(callback, None)
+            except Exception as e:
+                reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logger.error(f"Error in callback: {reason}")
+                failures = self._callback_failures.get(callback, 0) + 1
+                self._callback_failures[callback] = failures
+                if failures > self.MAX_CALLBACK_FAILURES:
+                    logger.warning(f"Dropping update callback after {failures} consecutive failures")
+                    self.remove_update_callback(callback)
+        
+        await asyncio.gather(*(run(callback) for callback in list(self.update_callbacks)))
     
     def export_data(self, format: str = "json") -> str:
-        """Export all data"""
+        """Export all data
+        
+        With orjson the dataclasses are serialized directly in C, skipping the
+        intermediate ``asdict`` copies. Where orjson supports fragments, each
+        flight snapshot, city and airport is encoded once and re-emitted as-is
+        by later exports until it is replaced by an update.
+        """
+        
+        if format == "json" and ORJSON_AVAILABLE:
+            if ORJSON_FRAGMENT_AVAILABLE:
+                payload = {
+                    "timestamp": self._last_update_iso,
+                    "flight_data": self._export_fragment("flights", self.flight_data),
+                    "weather_data": {
+                        city: self._export_fragment(f"weather:{city}", weather)
+                        for city, weather in self.weather_data.items()
+                    },
+                    "airport_status": {
+                        code: self._export_fragment(f"airport:{code}", status)
+                        for code, status in self.airport_status.items()
+                    },
+                    "metrics": self._metrics_snapshot()
+                }
+            else:
+                payload = {
+                    "timestamp": self._last_update_iso,
+                    "flight_data": self.flight_data,
+                    "weather_data": self.weather_data,
+                    "airport_status": self.airport_status,
+                    "metrics": self._metrics_snapshot()
+                }
+            return orjson.dumps(
+                payload,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode()
         
         data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._last_update_iso,
             "flight_data": [asdict(flight) for flight in self.flight_data],
             "weather_data": {city: asdict(weather) for city, weather in self.weather_data.items()},
             "airport_status": {code: asdict(status) for code, status in self.airport_status.items()},
-            "metrics": self.metrics
+            "metrics": self._metrics_snapshot()
         }
         
         if format == "json":
@@ -451,16 +1004,26 @@ class UnifiedAPIManager:
         else:
             return str(data)
     
+    def _export_fragment(self, slot: str, obj: Any):
+        """Pre-encoded JSON for ``obj``, reused while ``slot`` still holds the same object"""
+        
+        cached = self._export_fragments.get(slot)
+        if cached is None or cached[0] is not obj:
+            encoded = orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+            cached = self._export_fragments[slot] = (obj, orjson.Fragment(encoded))
+        return cached[1]
+    
     def reset_metrics(self):
         """Reset performance metrics"""
         
-        self.metrics = {
-            "total_requests": 0,
-            "successful_requests": 0,
-            "failed_requests": 0,
-            "data_points_collected": 0,
-            "last_update": datetime.now()
-        }
+        with self._metrics_lock:
+            self.metrics = {
+                "total_requests": 0,
+                "successful_requests": 0,
+                "failed_requests": 0,
+                "data_points_collected": 0,
+                "last_update": self._last_update
+            }
         logger.info("Performance metrics reset")
 
 def main():
@@ -8,15 +8,319 @@ import numpy as np
 import pandas as pd
 import math
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 from dataclasses import dataclass
+from itertools import chain
 import logging
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_NM = 3440.065
+
+# Pairs further apart than this (now) are not analyzed further
+SCREEN_HORIZONTAL_NM = 50.0
+SCREEN_VERTICAL_FT = 5000.0
+
+# Per-flight fields read during pair analysis
+FLIGHT_COLUMNS = (
+    'callsign', 'latitude', 'longitude', 'baro_altitude',
+    'velocity', 'true_track', 'vertical_rate'
+)
+
+# Rows of the pairwise distance matrix evaluated per NumPy block (bounds memory)
+_PAIR_BLOCK_ROWS = 256
+
+# Coarse flat-earth reject: pairs beyond this distance skip the haversine.
+# The margin covers the equirectangular error, which grows with latitude,
+# so the shortcut is only trusted below _FLAT_MAX_LAT.
+_FLAT_REJECT_NM = SCREEN_HORIZONTAL_NM * 1.1
+_FLAT_MAX_LAT = 80.0
+
+def _haversine_nm(lat1, lon1, lat2, lon2):
+    """Great-circle distance in nautical miles between arrays of points in degrees"""
+    
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(a))
+
+def _fast_flat_distance(lat1, lon1, lat2, lon2):
+    """Equirectangular distance in nautical miles (coarse, arrays in degrees)"""
+    
+    dy = (lat1 - lat2) * 60
+    dlon = (lon1 - lon2 + 180.0) % 360.0 - 180.0
+    dx = dlon * 60 * np.cos(np.radians((lat1 + lat2) / 2))
+    return np.sqrt(dx * dx + dy * dy)
+
+def _screen(lat, lon, alt, i_idx, j_idx) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the pairs within the screening volume"""
+    
+    # Cheap rejects first: altitude, then flat-earth distance
+    keep = np.abs(alt[i_idx] - alt[j_idx]) <= SCREEN_VERTICAL_FT
+    i_idx, j_idx = i_idx[keep], j_idx[keep]
+    lat1, lon1, lat2, lon2 = lat[i_idx], lon[i_idx], lat[j_idx], lon[j_idx]
+    keep = ((_fast_flat_distance(lat1, lon1, lat2, lon2) <= _FLAT_REJECT_NM) |
+            (np.maximum(np.abs(lat1), np.abs(lat2)) > _FLAT_MAX_LAT))
+    i_idx, j_idx = i_idx[keep], j_idx[keep]
+    
+    keep = _haversine_nm(lat[i_idx], lon[i_idx], lat[j_idx], lon[j_idx]) <= SCREEN_HORIZONTAL_NM
+    return i_idx[keep], j_idx[keep]
+
+def _candidate_pairs_dense(lat: np.ndarray, lon: np.ndarray,
+                           alt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Screen every pair with NumPy broadcasting over blocks of rows of the
+    upper triangle; pairs come back in row-major order.
+    """
+    
+    n = len(lat)
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    cos_lat = np.cos(lat_rad)
+    
+    i_parts, j_parts = [], []
+    for start in range(0, n - 1, _PAIR_BLOCK_ROWS):
+        rows = np.arange(start, min(start + _PAIR_BLOCK_ROWS, n - 1))
+        dlat = lat_rad[None, :] - lat_rad[rows, None]
+        dlon = lon_rad[None, :] - lon_rad[rows, None]
+        a = np.sin(dlat / 2) ** 2 + cos_lat[rows, None] * cos_lat[None, :] * np.sin(dlon / 2) ** 2
+        dist = 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(a))
+        alt_sep = np.abs(alt[None, :] - alt[rows, None])
+        
+        upper = np.arange(n)[None, :] > rows[:, None]
+        r, j = np.nonzero(upper & (dist <= SCREEN_HORIZONTAL_NM) & (alt_sep <= SCREEN_VERTICAL_FT))
+        i_parts.append(rows[r])
+        j_parts.append(j)
+    
+    if not i_parts:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(i_parts), np.concatenate(j_parts)
+
+def _candidate_pairs(lat: np.ndarray, lon: np.ndarray, alt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices (i, j), i < j, of aircraft pairs within the screening volume
+    
+    Aircraft are bucketed into a latitude/longitude/altitude grid whose cells
+    are at least as large as the screening volume, so only pairs in adjacent
+    cells can qualify; those are then checked exactly with a vectorized
+    haversine. Pairs come back in row-major order.
+    """
+    
+    n = len(lat)
+    if n < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    
+    # Cell sizes: a pair within the screening distance differs by at most
+    # lat_cell in latitude and lon_cell in longitude (bounded via the
+    # haversine term cos(lat1)cos(lat2)sin^2(dlon/2) at the highest latitude)
+    lat_cell = math.degrees(SCREEN_HORIZONTAL_NM / EARTH_RADIUS_NM)
+    cos_max_lat = math.cos(math.radians(min(float(np.abs(lat).max()), 90.0)))
+    half_angle = math.sin(SCREEN_HORIZONTAL_NM / (2 * EARTH_RADIUS_NM))
+    if cos_max_lat <= half_angle:
+        # Polar traffic: longitude no longer bounds distance
+        return _candidate_pairs_dense(lat, lon, alt)
+    lon_cell = math.degrees(2 * math.asin(half_angle / cos_max_lat))
+    n_lon = max(1, int(360.0 // lon_cell))
+    
+    cell_lat = np.floor((lat + 90.0) / lat_cell).astype(np.int64)
+    cell_lon = np.floor((lon + 180.0) / (360.0 / n_lon)).astype(np.int64) % n_lon
+    cell_alt = np.floor(alt / SCREEN_VERTICAL_FT).astype(np.int64)
+    cell_alt -= cell_alt.min() - 1
+    n_alt = int(cell_alt.max()) + 2
+    
+    def cell_key(d_lat, d_lon, d_alt):
+        return ((cell_lat + d_lat) * n_lon + (cell_lon + d_lon) % n_lon) * n_alt + cell_alt + d_alt
+    
+    own_keys = cell_key(0, 0, 0)
+    order = np.argsort(own_keys, kind='stable')
+    sorted_keys = own_keys[order]
+    aircraft = np.arange(n)
+    
+    codes = []
+    for d_lat in (-1, 0, 1):
+        for d_lon in (-1, 0, 1):
+            for d_alt in (-1, 0, 1):
+                keys = cell_key(d_lat, d_lon, d_alt)
+                lo = np.searchsorted(sorted_keys, keys, side='left')
+                counts = np.searchsorted(sorted_keys, keys, side='right') - lo
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                i_idx = np.repeat(aircraft, counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                j_idx = order[np.repeat(lo, counts) + offsets]
+                upper = i_idx < j_idx
+                codes.append(i_idx[upper] * n + j_idx[upper])
+    
+    if not codes:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    
+    # Neighbour cells can coincide when the grid wraps; unique also sorts row-major
+    codes = np.unique(np.concatenate(codes))
+    return _screen(lat, lon, alt, codes // n, codes % n)
+
+def velocity_components(speed: np.ndarray, track: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """East/north velocity components in knots, computed once per flight"""
+    
+    track_rad = np.radians(track)
+    return speed * np.sin(track_rad), speed * np.cos(track_rad)
+
+def _closest_approach_kernel(lat, lon, alt, vel_x, vel_y, climb, i_idx, j_idx, horizon,
+                             out_t, out_sep, out_dz, out_lat, out_lon, out_alt, out_rel_speed):
+    """Constant-velocity closest approach for each candidate pair (i_idx[k], j_idx[k])
+    
+    Flat-earth approximation: velocity components in knots, climb in ft/min,
+    separations in nm/ft. The approach location is aircraft i's position at
+    that time; the relative horizontal speed is reported in knots.
+    """
+    for k in prange(i_idx.shape[0]):
+        i = i_idx[k]
+        j = j_idx[k]
+        
+        # Velocity components (nautical miles / feet per second)
+        v1_x = vel_x[i] / 3600
+        v1_y = vel_y[i] / 3600
+        v1_z = climb[i] / 60
+        v2_x = vel_x[j] / 3600
+        v2_y = vel_y[j] / 3600
+        v2_z = climb[j] / 60
+        
+        rel_vx = v1_x - v2_x
+        rel_vy = v1_y - v2_y
+        rel_vz = v1_z - v2_z
+        out_rel_speed[k] = math.hypot(vel_x[i] - vel_x[j], vel_y[i] - vel_y[j])
+        
+        dx = (lon[i] - lon[j]) * 60
+        dy = (lat[i] - lat[j]) * 60
+        dz = alt[i] - alt[j]
+        
+        rel_speed_squared = rel_vx ** 2 + rel_vy ** 2
+        if rel_speed_squared < 1e-6:  # Aircraft moving in parallel
+            out_t[k] = 0.0
+            out_sep[k] = math.hypot(dx, dy)
+            out_dz[k] = abs(dz)
+            out_lat[k] = lat[i]
+            out_lon[k] = lon[i]
+            out_alt[k] = alt[i]
+            continue
+        
+        t = -(dx * rel_vx + dy * rel_vy) / rel_speed_squared
+        t = max(0.0, min(t, horizon))
+        
+        future_dx = dx + rel_vx * t
+        future_dy = dy + rel_vy * t
+        out_t[k] = t
+        out_sep[k] = math.hypot(future_dx, future_dy)
+        out_dz[k] = abs(dz + rel_vz * t)
+        out_lat[k] = lat[i] + v1_y * t / 60
+        out_lon[k] = lon[i] + v1_x * t / 60
+        out_alt[k] = alt[i] + v1_z * t
+
+if NUMBA_AVAILABLE:
+    # No fastmath 'nnan': NaN inputs from other callers must propagate as in NumPy
+    _closest_approach_kernel = njit(parallel=True, cache=True)(_closest_approach_kernel)
+
+def _closest_approach_numpy(lat, lon, alt, vel_x, vel_y, climb, i_idx, j_idx, horizon):
+    """NumPy equivalent of ``_closest_approach_kernel`` over all candidate pairs"""
+    
+    vx = vel_x / 3600
+    vy = vel_y / 3600
+    vz = climb / 60
+    
+    rel_vx = vx[i_idx] - vx[j_idx]
+    rel_vy = vy[i_idx] - vy[j_idx]
+    rel_vz = vz[i_idx] - vz[j_idx]
+    dx = (lon[i_idx] - lon[j_idx]) * 60
+    dy = (lat[i_idx] - lat[j_idx]) * 60
+    dz = alt[i_idx] - alt[j_idx]
+    
+    rel_speed_squared = rel_vx ** 2 + rel_vy ** 2
+    parallel = rel_speed_squared < 1e-6
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(parallel, 0.0,
+                     np.clip(-(dx * rel_vx + dy * rel_vy) / rel_speed_squared, 0.0, horizon))
+    
+    sep = np.hypot(dx + rel_vx * t, dy + rel_vy * t)
+    dz_at = np.abs(np.where(parallel, dz, dz + rel_vz * t))
+    loc_lat = lat[i_idx] + vy[i_idx] * t / 60
+    loc_lon = lon[i_idx] + vx[i_idx] * t / 60
+    loc_alt = np.where(parallel, alt[i_idx], alt[i_idx] + vz[i_idx] * t)
+    rel_speed = np.hypot(vel_x[i_idx] - vel_x[j_idx], vel_y[i_idx] - vel_y[j_idx])
+    return t, sep, dz_at, loc_lat, loc_lon, loc_alt, rel_speed
+
+def closest_approach_batch(lat, lon, alt, vel_x, vel_y, climb, i_idx, j_idx,
+                           horizon: float) -> Tuple[np.ndarray, ...]:
+    """Closest approach for candidate pairs (i_idx[k], j_idx[k])
+    
+    ``vel_x``/``vel_y`` come from ``velocity_components``. Returns arrays
+    ``(t, separation_nm, altitude_sep_ft, lat, lon, alt, relative_speed_kt)``.
+    Uses a parallel Numba kernel when numba is installed, NumPy otherwise.
+    """
+    lat, lon, alt, vel_x, vel_y, climb = (
+        np.ascontiguousarray(a, dtype=np.float64) for a in (lat, lon, alt, vel_x, vel_y, climb)
+    )
+    i_idx = np.ascontiguousarray(i_idx, dtype=np.intp)
+    j_idx = np.ascontiguousarray(j_idx, dtype=np.intp)
+    
+    if NUMBA_AVAILABLE:
+        out = tuple(np.empty(i_idx.shape[0]) for _ in range(7))
+        _closest_approach_kernel(lat, lon, alt, vel_x, vel_y, climb, i_idx, j_idx,
+                                 float(horizon), *out)
+        return out
+    
+    return _closest_approach_numpy(lat, lon, alt, vel_x, vel_y, climb, i_idx, j_idx, float(horizon))
+
+# Reported pairs of a detection cycle, one record per pair (rows index the
+# cycle's flight columns); LiveConflictAlert objects are built from these
+ALERT_DTYPE = np.dtype([
+    ('i', np.intp), ('j', np.intp),
+    ('probability', 'f8'), ('time_to_conflict', 'f8'),
+    ('separation_distance', 'f8'), ('altitude_separation', 'f8'),
+    ('latitude', 'f8'), ('longitude', 'f8'), ('altitude', 'f8'),
+    ('relative_speed', 'f8'),
+])
+
+def rank_alerts(alerts: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Indices of ``alerts`` by descending probability, then time to conflict
+    
+    Ties keep record order. With ``k`` only the first ``k`` are ranked, after
+    an ``np.partition`` cut on probability.
+    """
+    
+    neg_prob = -alerts['probability']
+    candidates = np.arange(len(alerts))
+    if k is not None and len(alerts) > k:
+        cutoff = np.partition(neg_prob, k - 1)[k - 1]
+        candidates = np.flatnonzero(neg_prob <= cutoff)
+    order = candidates[np.lexsort((alerts['time_to_conflict'][candidates], neg_prob[candidates]))]
+    return order[:k]
+
+def latest_per_aircraft(flights: pd.DataFrame) -> pd.DataFrame:
+    """Drop earlier reports of the same aircraft, keeping the last one
+    
+    Aircraft are identified by ``icao24``. Callsigns are not identities
+    (unnamed flights all report "UNKNOWN"), so rows without a usable
+    ``icao24`` are only dropped when they repeat an analyzed row exactly.
+    """
+    
+    if 'icao24' in flights:
+        icao24 = flights['icao24']
+        keyed = icao24.notna() & (icao24 != 'UNKNOWN')
+        flights = flights[~(keyed & icao24.duplicated(keep='last'))]
+    
+    return flights.drop_duplicates(subset=list(FLIGHT_COLUMNS), keep='last')
+
 @dataclass
 class LiveConflictAlert:
     """Real-time conflict alert structure"""
+    __slots__ = ('alert_id', 'aircraft_1', 'aircraft_2', 'conflict_probability', 'risk_level',
+                 'time_to_conflict', 'separation_distance', 'altitude_separation', 'relative_speed',
+                 'conflict_location', 'resolution_actions', 'detection_time', 'confidence_score')
+    
     alert_id: str
     aircraft_1: str
     aircraft_2: str
@@ -34,6 +338,15 @@ class LiveConflictAlert:
 class RealTimeConflictDetector:
     """Advanced real-time conflict detection for live flight data"""
     
+    # Resolution action templates
+    _TPL_CLIMB = "🔺 {cs}: Climb to maintain separation"
+    _TPL_DESCEND = "🔻 {cs}: Descend to maintain separation"
+    _TPL_TURN_RIGHT = "↪️ {cs}: Turn right 15° for 2 minutes"
+    _TPL_TURN_LEFT = "↩️ {cs}: Turn left 15° for 2 minutes"
+    _TPL_REDUCE_SPEED = "🐌 {cs}: Reduce speed by 20 knots"
+    _ACTION_IMMEDIATE = "⚠️ IMMEDIATE ATC INTERVENTION REQUIRED"
+    _ACTION_ALERT_PILOTS = "🔔 Alert pilots and prepare for vector changes"
+    
     def __init__(self):
         """Initialize the conflict detection system"""
         
@@ -50,10 +363,23 @@ class RealTimeConflictDetector:
             'LOW': 0.15        # 15-35% conflict probability
         }
         
+        # Labels for bucketing probabilities with searchsorted over the
+        # thresholds; anything below the LOW threshold is still reported as LOW
+        self._risk_labels = np.array(['LOW', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])
+        
         # Conflict detection cache
         self.conflict_cache = {}
         self.last_detection_time = None
         
+        # Per-flight state and pair results of the previous cycle, reused for
+        # pairs whose aircraft have not reported a new state since
+        self._last_cycle = None
+        
+        # All reported pairs of the last cycle (ALERT_DTYPE) and the flight
+        # columns they index; alerts beyond the top 20 are built on demand
+        self._alerts_arr = np.empty(0, dtype=ALERT_DTYPE)
+        self._alert_cols = {}
+        
     def detect_conflicts(self, flights_df: pd.DataFrame) -> List[LiveConflictAlert]:
         """
         Detect potential conflicts in real-time flight data
@@ -69,113 +395,178 @@ class RealTimeConflictDetector:
             return []
         
         current_time = datetime.now()
-        conflicts = []
         
-        # Filter for flights with complete trajectory data
+        # Filter for flights with complete trajectory data; a missing
+        # vertical rate means level flight
         valid_flights = flights_df.dropna(subset=[
             'latitude', 'longitude', 'baro_altitude', 'velocity', 'true_track'
         ])
+        valid_flights = valid_flights.assign(vertical_rate=valid_flights.get(
+            'vertical_rate', pd.Series(0.0, index=valid_flights.index)
+        ).fillna(0))
+        
+        # One row per aircraft (the latest report), so no pair is an aircraft
+        # against itself
+        valid_flights = latest_per_aircraft(valid_flights)
         
         if len(valid_flights) < 2:
             return []
         
-        # Pairwise conflict detection
-        for i in range(len(valid_flights)):
-            for j in range(i + 1, len(valid_flights)):
-                flight_1 = valid_flights.iloc[i]
-                flight_2 = valid_flights.iloc[j]
-                
-                # Skip if same aircraft
-                if flight_1['callsign'] == flight_2['callsign']:
-                    continue
-                
-                # Analyze potential conflict
-                conflict_alert = self._analyze_aircraft_pair(flight_1, flight_2, current_time)
-                
-                if conflict_alert and conflict_alert.conflict_probability > 0.1:  # Only report >10% probability
-                    conflicts.append(conflict_alert)
-        
-        # Sort by risk level and time to conflict
-        conflicts.sort(key=lambda x: (-x.conflict_probability, x.time_to_conflict))
+        # Single error boundary for the whole cycle; the per-pair math is
+        # exception-free on the cleaned columns
+        try:
+            cols, alerts = self._analyze_flights(valid_flights)
+            
+            # Top 20 conflicts by risk level and time to conflict
+            conflicts = self._build_alerts(cols, alerts[rank_alerts(alerts, 20)], current_time)
+        except Exception as e:
+            logger.error(f"Error detecting conflicts: {e}")
+            return []
         
         # Update cache
+        self._alerts_arr, self._alert_cols = alerts, cols
         self.conflict_cache = {alert.alert_id: alert for alert in conflicts}
         self.last_detection_time = current_time
         
-        return conflicts[:20]  # Return top 20 conflicts
+        return conflicts
     
-    def _analyze_aircraft_pair(self, flight_1: pd.Series, flight_2: pd.Series, 
-                              current_time: datetime) -> Optional[LiveConflictAlert]:
-        """Analyze a pair of aircraft for potential conflicts"""
+    def iter_alerts(self) -> Iterator[LiveConflictAlert]:
+        """All conflicts reported by the last ``detect_conflicts`` call, ranked
+        like its result and built lazily (it returns only the top 20)"""
         
-        try:
-            # Extract current positions and velocities
-            pos1 = (flight_1['latitude'], flight_1['longitude'], flight_1['baro_altitude'])
-            pos2 = (flight_2['latitude'], flight_2['longitude'], flight_2['baro_altitude'])
-            
-            vel1 = (flight_1['velocity'], flight_1['true_track'], 
-                   flight_1.get('vertical_rate', 0))
-            vel2 = (flight_2['velocity'], flight_2['true_track'], 
-                   flight_2.get('vertical_rate', 0))
-            
-            # Calculate current separation
-            horizontal_sep = self._calculate_horizontal_distance(pos1, pos2)
-            vertical_sep = abs(pos1[2] - pos2[2])
-            
-            # Skip if already well separated
-            if horizontal_sep > 50.0 or vertical_sep > 5000.0:  # 50nm or 5000ft
-                return None
-            
-            # Predict future positions and find closest approach
-            closest_approach = self._find_closest_approach(pos1, vel1, pos2, vel2)
-            
-            if not closest_approach:
-                return None
-            
-            time_to_closest, min_separation, approach_altitude_sep, approach_location = closest_approach
-            
-            # Calculate conflict probability
-            conflict_prob = self._calculate_conflict_probability(
-                min_separation, approach_altitude_sep, time_to_closest, vel1, vel2
-            )
-            
-            # Skip low probability conflicts in busy airspace
-            if conflict_prob < 0.1:
-                return None
-            
-            # Determine risk level
-            risk_level = self._determine_risk_level(conflict_prob)
-            
-            # Calculate relative speed
-            relative_speed = self._calculate_relative_speed(vel1, vel2)
+        for k in rank_alerts(self._alerts_arr):
+            yield from self._build_alerts(self._alert_cols, self._alerts_arr[k:k + 1],
+                                          self.last_detection_time)
+    
+    def _analyze_flights(self, valid_flights: pd.DataFrame) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Flight columns and ALERT_DTYPE records of the reportable aircraft
+        pairs in ``valid_flights`` (complete rows only)"""
+        
+        # Columnar copies of the fields used per pair, indexed by row position
+        cols = {c: valid_flights[c].to_numpy() for c in FLIGHT_COLUMNS}
+        cols['aircraft'] = valid_flights.get('icao24', valid_flights['callsign']).to_numpy()
+        
+        # Track trig once per flight rather than once per pair
+        cols['vel_x'], cols['vel_y'] = velocity_components(
+            cols['velocity'].astype(float), cols['true_track'].astype(float)
+        )
+        
+        # Screen all pairs at once; only nearby pairs get the detailed analysis
+        i_idx, j_idx = _candidate_pairs(
+            cols['latitude'].astype(float),
+            cols['longitude'].astype(float),
+            cols['baro_altitude'].astype(float)
+        )
+        
+        # Predict closest approach for every candidate pair in one batch
+        approaches = self._closest_approaches(cols, i_idx, j_idx)
+        
+        t, sep, dz, *_, rel_speed = approaches
+        
+        # Score every pair in one vectorized pass
+        probabilities = self._calculate_conflict_probability(sep, dz, t, rel_speed)
+        
+        # Only report >10% probability
+        reported = probabilities > 0.1
+        alerts = np.empty(int(reported.sum()), dtype=ALERT_DTYPE)
+        alerts['i'], alerts['j'] = i_idx[reported], j_idx[reported]
+        alerts['probability'] = probabilities[reported]
+        for name, values in zip(ALERT_DTYPE.names[3:], approaches):
+            alerts[name] = values[reported]
+        
+        return cols, alerts
+    
+    def _closest_approaches(self, cols: Dict[str, np.ndarray], i_idx: np.ndarray,
+                            j_idx: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """``closest_approach_batch`` output for the candidate pairs, recomputing
+        only pairs where either aircraft changed since the previous cycle
+        
+        A flight counts as unchanged when its position, velocity components
+        and climb rate are identical to last cycle's, so reused rows are
+        exactly what a fresh computation would give. Flights are matched to
+        last cycle's by ``icao24`` (callsign without it), and nothing is reused
+        unless those keys are unique.
+        """
+        
+        state = np.column_stack([
+            cols[c].astype(float) for c in
+            ('latitude', 'longitude', 'baro_altitude', 'vel_x', 'vel_y', 'vertical_rate')
+        ])
+        aircraft = pd.Index(cols['aircraft'])
+        approaches = tuple(np.empty(len(i_idx)) for _ in range(7))
+        dirty = np.ones(len(i_idx), dtype=bool)
+        
+        last = self._last_cycle
+        if (last is not None and aircraft.is_unique and len(last['pair_codes'])
+                and last['horizon'] == self.prediction_horizon):
+            prev_row = last['aircraft'].get_indexer(aircraft)
+            prev_state = last['state'][np.maximum(prev_row, 0)]
+            unchanged = (prev_row >= 0) & np.all(state == prev_state, axis=1)
             
+            # Look up each pair's previous result by its (row, row) code
+            prev_i, prev_j = prev_row[i_idx], prev_row[j_idx]
+            codes = prev_i * len(last['aircraft']) + prev_j
+            pos = np.minimum(np.searchsorted(last['pair_codes'], codes), len(last['pair_codes']) - 1)
+            found = (unchanged[i_idx] & unchanged[j_idx] & (prev_i < prev_j) &
+                     (last['pair_codes'][pos] == codes))
+            for out, prev in zip(approaches, last['approaches']):
+                out[found] = prev[pos[found]]
+            dirty = ~found
+        
+        fresh = closest_approach_batch(
+            cols['latitude'], cols['longitude'], cols['baro_altitude'],
+            cols['vel_x'], cols['vel_y'], cols['vertical_rate'],
+            i_idx[dirty], j_idx[dirty], self.prediction_horizon
+        )
+        for out, new in zip(approaches, fresh):
+            out[dirty] = new
+        
+        # Candidate pairs arrive in row-major order, so their codes are sorted
+        self._last_cycle = {
+            'aircraft': aircraft,
+            'state': state,
+            'pair_codes': i_idx * len(aircraft) + j_idx,
+            'approaches': approaches,
+            'horizon': self.prediction_horizon,
+        } if aircraft.is_unique else None
+        
+        return approaches
+    
+    def _build_alerts(self, cols: Dict[str, np.ndarray], alerts: np.ndarray,
+                      current_time: datetime) -> List[LiveConflictAlert]:
+        """Materialize ``LiveConflictAlert`` objects for ALERT_DTYPE records"""
+        
+        risk_levels = self._determine_risk_level(alerts['probability']).tolist()
+        ts_int = int(current_time.timestamp())  # Shared by every alert id this cycle
+        conflicts = []
+        for (i, j, conflict_prob, time_to_closest, min_separation, approach_altitude_sep,
+             lat, lon, alt, relative_speed), risk_level in zip(alerts.tolist(), risk_levels):
             # Generate resolution actions
             resolution_actions = self._generate_resolution_actions(
-                flight_1, flight_2, min_separation, approach_altitude_sep, time_to_closest
+                cols, i, j, min_separation, approach_altitude_sep, time_to_closest
             )
             
             # Create conflict alert
-            alert_id = f"CONF_{flight_1['callsign']}_{flight_2['callsign']}_{int(current_time.timestamp())}"
+            callsign_1, callsign_2 = cols['callsign'][i], cols['callsign'][j]
+            alert_id = f"CONF_{callsign_1}_{callsign_2}_{ts_int}"
             
-            return LiveConflictAlert(
+            conflicts.append(LiveConflictAlert(
                 alert_id=alert_id,
-                aircraft_1=flight_1['callsign'],
-                aircraft_2=flight_2['callsign'],
+                aircraft_1=callsign_1,
+                aircraft_2=callsign_2,
                 conflict_probability=conflict_prob,
                 risk_level=risk_level,
                 time_to_conflict=time_to_closest,
                 separation_distance=min_separation,
                 altitude_separation=approach_altitude_sep,
                 relative_speed=relative_speed,
-                conflict_location=approach_location,
+                conflict_location=(lat, lon, alt),
                 resolution_actions=resolution_actions,
                 detection_time=current_time,
                 confidence_score=min(0.95, conflict_prob + 0.1)
-            )
-            
-        except Exception as e:
-            logger.error(f"Error analyzing aircraft pair: {e}")
-            return None
+            ))
+        
+        return conflicts
     
     def _calculate_horizontal_distance(self, pos1: Tuple, pos2: Tuple) -> float:
         """Calculate horizontal distance in nautical miles"""
@@ -193,172 +584,84 @@ class RealTimeConflictDetector:
              math.sin(dlon/2)**2)
         c = 2 * math.asin(math.sqrt(a))
         
-        # Earth radius in nautical miles
-        earth_radius_nm = 3440.065
-        
-        return c * earth_radius_nm
+        return c * EARTH_RADIUS_NM
     
-    def _find_closest_approach(self, pos1: Tuple, vel1: Tuple, pos2: Tuple, vel2: Tuple) -> Optional[Tuple]:
-        """Find the closest approach point between two aircraft"""
+    def _calculate_conflict_probability(self, min_separation: np.ndarray, altitude_sep: np.ndarray,
+                                      time_to_conflict: np.ndarray,
+                                      relative_speed: np.ndarray) -> np.ndarray:
+        """Calculate conflict probability based on multiple factors
         
-        try:
-            # Extract positions and velocities
-            lat1, lon1, alt1 = pos1
-            lat2, lon2, alt2 = pos2
-            speed1, track1, climb_rate1 = vel1
-            speed2, track2, climb_rate2 = vel2
-            
-            # Convert to Cartesian coordinates for easier calculation
-            # (Simplified - assumes small area, flat earth approximation)
-            
-            # Calculate velocity components (nautical miles per second)
-            v1_x = speed1 * math.sin(math.radians(track1)) / 3600
-            v1_y = speed1 * math.cos(math.radians(track1)) / 3600
-            v1_z = climb_rate1 / 60  # feet per second
-            
-            v2_x = speed2 * math.sin(math.radians(track2)) / 3600
-            v2_y = speed2 * math.cos(math.radians(track2)) / 3600
-            v2_z = climb_rate2 / 60  # feet per second
-            
-            # Relative velocity
-            rel_vx = v1_x - v2_x
-            rel_vy = v1_y - v2_y
-            rel_vz = v1_z - v2_z
-            
-            # Initial separation in approximate Cartesian coordinates
-            # (rough conversion for small distances)
-            dx = (lon1 - lon2) * 60  # nautical miles
-            dy = (lat1 - lat2) * 60  # nautical miles
-            dz = alt1 - alt2  # feet
-            
-            # Time to closest approach (assuming constant velocity)
-            rel_speed_squared = rel_vx**2 + rel_vy**2
-            
-            if rel_speed_squared < 1e-6:  # Aircraft moving in parallel
-                # Calculate current separation
-                horizontal_sep = math.sqrt(dx**2 + dy**2)
-                return (0, horizontal_sep, abs(dz), (lat1, lon1, alt1))
-            
-            # Time to closest approach in horizontal plane
-            t_closest = -(dx * rel_vx + dy * rel_vy) / rel_speed_squared
-            
-            # Limit prediction horizon
-            t_closest = max(0, min(t_closest, self.prediction_horizon))
-            
-            # Calculate positions at closest approach
-            future_dx = dx + rel_vx * t_closest
-            future_dy = dy + rel_vy * t_closest
-            future_dz = dz + rel_vz * t_closest
-            
-            # Minimum horizontal separation
-            min_horizontal_sep = math.sqrt(future_dx**2 + future_dy**2)
-            
-            # Future positions
-            future_lat1 = lat1 + v1_y * t_closest / 60
-            future_lon1 = lon1 + v1_x * t_closest / 60
-            future_alt1 = alt1 + v1_z * t_closest
-            
-            approach_location = (future_lat1, future_lon1, future_alt1)
-            
-            return (t_closest, min_horizontal_sep, abs(future_dz), approach_location)
-            
-        except Exception as e:
-            logger.error(f"Error calculating closest approach: {e}")
-            return None
-    
-    def _calculate_conflict_probability(self, min_separation: float, altitude_sep: float,
-                                      time_to_conflict: float, vel1: Tuple, vel2: Tuple) -> float:
-        """Calculate conflict probability based on multiple factors"""
+        Vectorized over candidate pairs: all arguments are arrays of equal length.
+        """
         
         # Base probability based on separation
-        if min_separation < self.min_horizontal_separation and altitude_sep < self.min_vertical_separation:
-            base_prob = 1.0  # Definite conflict
-        else:
-            # Inverse relationship with separation
-            horizontal_factor = max(0, 1 - (min_separation / (self.min_horizontal_separation * 2)))
-            vertical_factor = max(0, 1 - (altitude_sep / (self.min_vertical_separation * 2)))
-            base_prob = (horizontal_factor + vertical_factor) / 2
+        definite = ((min_separation < self.min_horizontal_separation) &
+                    (altitude_sep < self.min_vertical_separation))
+        # Inverse relationship with separation
+        horizontal_factor = np.maximum(0.0, 1 - (min_separation / (self.min_horizontal_separation * 2)))
+        vertical_factor = np.maximum(0.0, 1 - (altitude_sep / (self.min_vertical_separation * 2)))
+        base_prob = np.where(definite, 1.0, (horizontal_factor + vertical_factor) / 2)
         
         # Time factor (higher probability for near-term conflicts)
-        time_factor = max(0.1, 1 - (time_to_conflict / self.prediction_horizon))
+        time_factor = np.maximum(0.1, 1 - (time_to_conflict / self.prediction_horizon))
         
         # Speed factor (higher relative speeds increase uncertainty)
-        relative_speed = self._calculate_relative_speed(vel1, vel2)
-        speed_factor = min(1.0, 1 + (relative_speed - 200) / 1000)  # Normalize around 200kt
+        speed_factor = np.minimum(1.0, 1 + (relative_speed - 200) / 1000)  # Normalize around 200kt
         
         # Combine factors
         probability = base_prob * time_factor * speed_factor
         
-        # Apply uncertainty for longer predictions
-        if time_to_conflict > 600:  # 10 minutes
-            uncertainty_reduction = 1 - ((time_to_conflict - 600) / self.prediction_horizon)
-            probability *= uncertainty_reduction
+        # Apply uncertainty for longer predictions (beyond 10 minutes)
+        uncertainty_reduction = 1 - ((time_to_conflict - 600) / self.prediction_horizon)
+        probability = np.where(time_to_conflict > 600, probability * uncertainty_reduction, probability)
         
-        return max(0.0, min(1.0, probability))
+        return np.clip(probability, 0.0, 1.0)
     
-    def _calculate_relative_speed(self, vel1: Tuple, vel2: Tuple) -> float:
-        """Calculate relative speed between two aircraft"""
-        
-        speed1, track1, _ = vel1
-        speed2, track2, _ = vel2
-        
-        # Calculate velocity components
-        v1_x = speed1 * math.sin(math.radians(track1))
-        v1_y = speed1 * math.cos(math.radians(track1))
-        v2_x = speed2 * math.sin(math.radians(track2))
-        v2_y = speed2 * math.cos(math.radians(track2))
+    def _determine_risk_level(self, probability):
+        """Determine risk level based on conflict probability
         
-        # Relative velocity magnitude
-        rel_vx = v1_x - v2_x
-        rel_vy = v1_y - v2_y
-        
-        return math.sqrt(rel_vx**2 + rel_vy**2)
-    
-    def _determine_risk_level(self, probability: float) -> str:
-        """Determine risk level based on conflict probability"""
+        Accepts a single probability or an array of them (one label each).
+        """
         
-        if probability >= self.risk_thresholds['CRITICAL']:
-            return 'CRITICAL'
-        elif probability >= self.risk_thresholds['HIGH']:
-            return 'HIGH'
-        elif probability >= self.risk_thresholds['MEDIUM']:
-            return 'MEDIUM'
-        else:
-            return 'LOW'
+        # Read the thresholds on every call so later changes to them take effect
+        bounds = [self.risk_thresholds[level] for level in ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')]
+        levels = self._risk_labels[np.searchsorted(bounds, probability, side='right')]
+        return levels if isinstance(levels, np.ndarray) else str(levels)
     
-    def _generate_resolution_actions(self, flight_1: pd.Series, flight_2: pd.Series,
+    def _generate_resolution_actions(self, cols: Dict[str, np.ndarray], i: int, j: int,
                                    min_separation: float, altitude_sep: float,
                                    time_to_conflict: float) -> List[str]:
         """Generate conflict resolution suggestions"""
         
         actions = []
+        callsign_1, callsign_2 = cols['callsign'][i], cols['callsign'][j]
         
         # Determine primary resolution based on separation type
         if altitude_sep < self.min_vertical_separation:
             # Vertical separation needed
-            if flight_1['baro_altitude'] > flight_2['baro_altitude']:
-                actions.append(f"🔺 {flight_1['callsign']}: Climb to maintain separation")
-                actions.append(f"🔻 {flight_2['callsign']}: Descend to maintain separation")
+            if cols['baro_altitude'][i] > cols['baro_altitude'][j]:
+                actions.append(self._TPL_CLIMB.format(cs=callsign_1))
+                actions.append(self._TPL_DESCEND.format(cs=callsign_2))
             else:
-                actions.append(f"🔺 {flight_2['callsign']}: Climb to maintain separation")
-                actions.append(f"🔻 {flight_1['callsign']}: Descend to maintain separation")
+                actions.append(self._TPL_CLIMB.format(cs=callsign_2))
+                actions.append(self._TPL_DESCEND.format(cs=callsign_1))
         
         if min_separation < self.min_horizontal_separation:
             # Horizontal separation needed
-            actions.append(f"↪️ {flight_1['callsign']}: Turn right 15° for 2 minutes")
-            actions.append(f"↩️ {flight_2['callsign']}: Turn left 15° for 2 minutes")
+            actions.append(self._TPL_TURN_RIGHT.format(cs=callsign_1))
+            actions.append(self._TPL_TURN_LEFT.format(cs=callsign_2))
             
             # Speed adjustments
-            if flight_1['velocity'] > flight_2['velocity']:
-                actions.append(f"🐌 {flight_1['callsign']}: Reduce speed by 20 knots")
+            if cols['velocity'][i] > cols['velocity'][j]:
+                actions.append(self._TPL_REDUCE_SPEED.format(cs=callsign_1))
             else:
-                actions.append(f"🐌 {flight_2['callsign']}: Reduce speed by 20 knots")
+                actions.append(self._TPL_REDUCE_SPEED.format(cs=callsign_2))
         
         # Time-critical actions
         if time_to_conflict < 300:  # 5 minutes
-            actions.append("⚠️ IMMEDIATE ATC INTERVENTION REQUIRED")
+            actions.append(self._ACTION_IMMEDIATE)
         elif time_to_conflict < 600:  # 10 minutes
-            actions.append("🔔 Alert pilots and prepare for vector changes")
+            actions.append(self._ACTION_ALERT_PILOTS)
         
         return actions[:5]  # Limit to 5 most important actions
 
@@ -375,20 +678,19 @@ def get_conflict_summary_stats(conflicts: List[LiveConflictAlert]) -> Dict:
             'aircraft_involved': 0
         }
     
-    # Count by risk level
+    # Gather the fields once, then reduce with NumPy
+    n = len(conflicts)
+    times = np.fromiter((c.time_to_conflict for c in conflicts), dtype=float, count=n)
+    separations = np.fromiter((c.separation_distance for c in conflicts), dtype=float, count=n)
+    levels, counts = np.unique([c.risk_level for c in conflicts], return_counts=True)
     risk_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-    for conflict in conflicts:
-        risk_counts[conflict.risk_level] += 1
+    risk_counts.update(zip(levels.tolist(), counts.tolist()))
     
-    # Calculate statistics
-    avg_time = sum(c.time_to_conflict for c in conflicts) / len(conflicts)
-    min_sep = min(c.separation_distance for c in conflicts)
+    avg_time = float(times.mean())
+    min_sep = float(separations.min())
     
     # Count unique aircraft involved
-    aircraft_involved = set()
-    for conflict in conflicts:
-        aircraft_involved.add(conflict.aircraft_1)
-        aircraft_involved.add(conflict.aircraft_2)
+    aircraft_involved = set(chain.from_iterable((c.aircraft_1, c.aircraft_2) for c in conflicts))
     
     return {
         'total_conflicts': len(conflicts),
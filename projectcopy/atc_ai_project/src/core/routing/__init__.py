@@ -3,6 +3,6 @@ Weather-Adaptive Routing Module
 Advanced AI-powered flight route optimization with weather consideration
 """
 
-from .weather_adaptive_router import WeatherAdaptiveRouter, WeatherData, RouteWaypoint, FlightRoute, RouteComparison
+from .weather_adaptive_router import WeatherAdaptiveRouter, WeatherData, WeatherArray, RouteWaypoint, FlightRoute, RouteComparison
 
-__all__ = ['WeatherAdaptiveRouter', 'WeatherData', 'RouteWaypoint', 'FlightRoute', 'RouteComparison']
\ No newline at end of file
+__all__ = ['WeatherAdaptiveRouter', 'WeatherData', 'WeatherArray', 'RouteWaypoint', 'FlightRoute', 'RouteComparison']
\ No newline at end of file
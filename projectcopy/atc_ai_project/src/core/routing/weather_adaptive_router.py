@@ -7,18 +7,100 @@ Patent-ready algorithms for intelligent flight path planning
 
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, astuple
 from typing import List, Tuple, Dict, Optional
 import math
+import heapq
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
 from datetime import datetime, timedelta
 import logging
 
+try:
+    from numba import njit, vectorize
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _hav_nm(lat1, lon1, lat2, lon2):
+    """Great circle distance in nautical miles between two points in degrees"""
+    R = 3440.065  # Earth's radius in nautical miles
+    
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+    
+    a = (math.sin(delta_lat / 2) ** 2 + 
+         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
+    c = 2 * math.asin(math.sqrt(min(1.0, a)))  # Rounding can push a just past 1
+    
+    return R * c
+
+def _slerp(lat1_deg, lon1_deg, lat2_deg, lon2_deg, fraction):
+    """Point at ``fraction`` along the great circle between two points (degrees)"""
+    lat1, lon1 = math.radians(lat1_deg), math.radians(lon1_deg)
+    lat2, lon2 = math.radians(lat2_deg), math.radians(lon2_deg)
+    
+    # Spherical interpolation
+    delta = 2 * math.asin(math.sqrt(
+        math.sin((lat2 - lat1) / 2) ** 2 + 
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    ))
+    
+    if delta == 0:
+        return lat1_deg, lon1_deg
+    
+    a = math.sin((1 - fraction) * delta) / math.sin(delta)
+    b = math.sin(fraction * delta) / math.sin(delta)
+    
+    x = a * math.cos(lat1) * math.cos(lon1) + b * math.cos(lat2) * math.cos(lon2)
+    y = a * math.cos(lat1) * math.sin(lon1) + b * math.cos(lat2) * math.sin(lon2)
+    z = a * math.sin(lat1) + b * math.sin(lat2)
+    
+    lat = math.atan2(z, math.sqrt(x ** 2 + y ** 2))
+    lon = math.atan2(y, x)
+    
+    return math.degrees(lat), math.degrees(lon)
+
+if NUMBA_AVAILABLE:
+    # Compiled ufunc for arrays of point pairs, broadcasting like any NumPy ufunc
+    _hav_nm_ufunc = vectorize(['float64(float64, float64, float64, float64)'], cache=True)(_hav_nm)
+    
+    # Scalar kernels called per waypoint and per search candidate
+    _hav_nm = njit(cache=True, fastmath=True)(_hav_nm)
+    _slerp = njit(cache=True, fastmath=True)(_slerp)
+
+# Cumulative turbulence level probabilities for levels 0-5
+_TURBULENCE_CDF = np.cumsum([0.3, 0.3, 0.2, 0.1, 0.08, 0.02])[:-1]
+
+# Temperature mean/std and wind base/scale for polar, tropical and temperate regions
+_REGION_WEATHER = np.array([[-20.0, 10.0, 15.0, 10.0],
+                            [25.0, 5.0, 5.0, 8.0],
+                            [10.0, 15.0, 8.0, 12.0]])
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+def _splitmix64(z: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied elementwise to uint64 arrays"""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def _hash_uniforms(seeds: np.ndarray, draws: int) -> np.ndarray:
+    """Uniform draws in (0, 1), shape (draws, len(seeds)); column i depends only on seeds[i]"""
+    state = _splitmix64(seeds.astype(np.uint64))
+    bits = _splitmix64(state + np.arange(1, draws + 1, dtype=np.uint64)[:, None] * _GOLDEN_GAMMA)
+    return ((bits >> np.uint64(11)).astype(np.float64) + 0.5) / 2.0 ** 53
+
 @dataclass
 class WeatherData:
     """Weather information for route planning"""
@@ -35,6 +117,51 @@ class WeatherData:
     icing_risk: float  # 0-1 probability
     thunderstorm_risk: float  # 0-1 probability
 
+@dataclass
+class WeatherArray:
+    """Weather information for many points, one numpy array per field"""
+    latitude: np.ndarray
+    longitude: np.ndarray
+    wind_speed: np.ndarray
+    wind_direction: np.ndarray
+    temperature: np.ndarray
+    pressure: np.ndarray
+    visibility: np.ndarray
+    precipitation: np.ndarray
+    cloud_coverage: np.ndarray
+    turbulence_level: np.ndarray
+    icing_risk: np.ndarray
+    thunderstorm_risk: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.latitude)
+    
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> 'WeatherArray':
+        """Build from per-point tuples in field order, as produced by ``rows``"""
+        columns = [np.array(column) for column in zip(*rows)] if rows else [np.empty(0)] * 12
+        return cls(*columns)
+    
+    def rows(self) -> List[tuple]:
+        """Per-point tuples of all fields in field order"""
+        return list(zip(*(getattr(self, f.name).tolist() for f in fields(self))))
+    
+    def __getitem__(self, i: int) -> WeatherData:
+        return WeatherData(
+            latitude=float(self.latitude[i]),
+            longitude=float(self.longitude[i]),
+            wind_speed=float(self.wind_speed[i]),
+            wind_direction=float(self.wind_direction[i]),
+            temperature=float(self.temperature[i]),
+            pressure=float(self.pressure[i]),
+            visibility=float(self.visibility[i]),
+            precipitation=float(self.precipitation[i]),
+            cloud_coverage=float(self.cloud_coverage[i]),
+            turbulence_level=int(self.turbulence_level[i]),
+            icing_risk=float(self.icing_risk[i]),
+            thunderstorm_risk=float(self.thunderstorm_risk[i])
+        )
+
 @dataclass
 class RouteWaypoint:
     """Individual waypoint in flight route"""
@@ -47,6 +174,42 @@ class RouteWaypoint:
     safety_score: float  # 0-1 scale
     efficiency_score: float  # 0-1 scale
 
+@dataclass
+class WaypointArray:
+    """Route waypoints as parallel numpy arrays, one per field
+    
+    Geometry is float64; fuel and the 0-1 scores are stored as float32.
+    """
+    lat: np.ndarray
+    lon: np.ndarray
+    alt: np.ndarray
+    fuel: np.ndarray
+    impact: np.ndarray
+    safety: np.ndarray
+    efficiency: np.ndarray
+    estimated_time: np.ndarray  # datetime64[us]
+    
+    @classmethod
+    def empty(cls, n: int) -> 'WaypointArray':
+        return cls(*(np.empty(n) for _ in range(3)),
+                   *(np.empty(n, dtype=np.float32) for _ in range(4)),
+                   np.empty(n, dtype='datetime64[us]'))
+    
+    def __len__(self) -> int:
+        return len(self.lat)
+    
+    def schedule(self, departure_time: datetime, duration: timedelta):
+        """Space estimated times evenly from departure to arrival after ``duration``"""
+        fractions = np.arange(len(self)) / (len(self) - 1)
+        offsets = np.rint(fractions * (duration / timedelta(microseconds=1))).astype('timedelta64[us]')
+        self.estimated_time[:] = np.datetime64(departure_time, 'us') + offsets
+    
+    def to_waypoints(self) -> List['RouteWaypoint']:
+        """Materialize as a list of ``RouteWaypoint`` for callers that iterate waypoints"""
+        return [RouteWaypoint(*row) for row in zip(
+            self.lat.tolist(), self.lon.tolist(), self.alt.tolist(), self.estimated_time.tolist(),
+            self.fuel.tolist(), self.impact.tolist(), self.safety.tolist(), self.efficiency.tolist())]
+
 @dataclass
 class FlightRoute:
     """Complete flight route with analysis"""
@@ -63,6 +226,7 @@ class FlightRoute:
     weather_severity: float  # 0-1 scale
     route_type: str  # "optimal", "weather_avoidance", "direct", "fuel_efficient"
     cost_savings: float  # USD
+    waypoint_array: Optional[WaypointArray] = None  # SoA view of waypoints
 
 @dataclass
 class RouteComparison:
@@ -79,29 +243,37 @@ class WeatherAPIManager:
     
     def __init__(self):
         self.openweather_key = "demo_key"  # Replace with actual key
-        self.cache = {}
+        self.cache = OrderedDict()  # LRU order, oldest first
         self.cache_ttl = 1800  # 30 minutes
+        self.cache_size = 4096
+        self._cache_lock = threading.Lock()  # Routes are computed on worker threads
+    
+    def _cache_key(self, lat: float, lon: float) -> tuple:
+        """0.01 degree cell of a point plus the current TTL bucket, which expires entries"""
+        return (round(lat * 100), round(lon * 100), int(time.time() // self.cache_ttl))
     
     def get_weather_data(self, lat: float, lon: float) -> WeatherData:
         """Get weather data for specific coordinates"""
-        cache_key = f"{lat:.2f}_{lon:.2f}"
-        current_time = datetime.now().timestamp()
+        cache_key = self._cache_key(lat, lon)
         
-        # Check cache first
-        if (cache_key in self.cache and 
-            current_time - self.cache[cache_key]['timestamp'] < self.cache_ttl):
-            return self.cache[cache_key]['data']
+        # Check cache first; entries are field tuples shared with the batch path
+        with self._cache_lock:
+            row = self.cache.get(cache_key)
+            if row is not None:
+                self.cache.move_to_end(cache_key)
+                return WeatherData(*row)
         
         try:
-            # Try OpenWeatherMap API (demo implementation)
-            weather_data = self._fetch_openweather_data(lat, lon)
+            # Try OpenWeatherMap API (demo implementation) at the cell center, outside the lock
+            weather_data = self._fetch_openweather_data(cache_key[0] / 100, cache_key[1] / 100)
             
-            # Cache the result
-            self.cache[cache_key] = {
-                'data': weather_data,
-                'timestamp': current_time
-            }
+            # Cache the result, evicting the least recently used entry
+            with self._cache_lock:
+                self.cache[cache_key] = astuple(weather_data)
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
             
+            weather_data.latitude, weather_data.longitude = lat, lon
             return weather_data
             
         except Exception as e:
@@ -118,35 +290,110 @@ class WeatherAPIManager:
         # For demo, generate realistic synthetic data
         return self._generate_synthetic_weather(lat, lon)
     
+    def get_weather_batch(self, lats: np.ndarray, lons: np.ndarray,
+                          memo: Optional[dict] = None) -> WeatherArray:
+        """Get weather data for arrays of coordinates in one vectorized call
+        
+        Like ``get_weather_data``, weather is sampled at the center of each point's
+        0.01 degree cell. Cells are served from ``memo`` (an optional request-scoped
+        dict shared by callers), then the shared cache, and the rest are fetched in
+        one batch.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        if memo is None:
+            memo = {}
+        
+        cells = list(zip(np.round(lats * 100).astype(np.int64).tolist(),
+                         np.round(lons * 100).astype(np.int64).tolist()))
+        bucket = int(time.time() // self.cache_ttl)
+        
+        missing = [cell for cell in dict.fromkeys(cells) if cell not in memo]
+        if missing:
+            fetch = []
+            with self._cache_lock:
+                for cell in missing:
+                    row = self.cache.get(cell + (bucket,))
+                    if row is None:
+                        fetch.append(cell)
+                    else:
+                        self.cache.move_to_end(cell + (bucket,))
+                        memo.setdefault(cell, row)
+            
+            if fetch:
+                centers = np.array(fetch, dtype=float) / 100
+                fetched = self._fetch_weather_batch(centers[:, 0], centers[:, 1]).rows()
+                with self._cache_lock:
+                    for cell, row in zip(fetch, fetched):
+                        self.cache[cell + (bucket,)] = row
+                    while len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+                for cell, row in zip(fetch, fetched):
+                    memo.setdefault(cell, row)
+        
+        weather = WeatherArray.from_rows([memo[cell] for cell in cells])
+        weather.latitude, weather.longitude = lats, lons
+        return weather
+    
+    def _fetch_weather_batch(self, lats: np.ndarray, lons: np.ndarray) -> WeatherArray:
+        """Fetch weather for arrays of coordinates"""
+        # Demo source is synthetic; a production API would be queried once per batch here
+        return self._generate_synthetic_weather_batch(lats, lons)
+    
     def _generate_synthetic_weather(self, lat: float, lon: float) -> WeatherData:
         """Generate realistic synthetic weather data"""
-        # Seed based on coordinates for consistency
-        np.random.seed(int((lat + lon) * 1000) % 2147483647)
-        
-        # Base weather patterns on geographic location
-        if abs(lat) > 60:  # Polar regions
-            base_temp = -20 + np.random.normal(0, 10)
-            wind_speed = 15 + np.random.exponential(10)
-        elif abs(lat) < 30:  # Tropical regions
-            base_temp = 25 + np.random.normal(0, 5)
-            wind_speed = 5 + np.random.exponential(8)
-        else:  # Temperate regions
-            base_temp = 10 + np.random.normal(0, 15)
-            wind_speed = 8 + np.random.exponential(12)
-        
-        return WeatherData(
-            latitude=lat,
-            longitude=lon,
-            wind_speed=max(0, wind_speed),
-            wind_direction=np.random.uniform(0, 360),
-            temperature=base_temp,
-            pressure=1013.25 + np.random.normal(0, 20),
-            visibility=max(1, 10 - np.random.exponential(2)),
-            precipitation=max(0, np.random.exponential(2)),
-            cloud_coverage=np.random.uniform(0, 100),
-            turbulence_level=int(np.random.choice([0, 1, 2, 3, 4, 5], p=[0.3, 0.3, 0.2, 0.1, 0.08, 0.02])),
-            icing_risk=max(0, min(1, (base_temp < 0) * np.random.uniform(0, 0.8))),
-            thunderstorm_risk=max(0, min(1, (base_temp > 20) * np.random.uniform(0, 0.3)))
+        weather = self._generate_synthetic_weather_batch(np.array([lat], dtype=float),
+                                                         np.array([lon], dtype=float))[0]
+        weather.latitude, weather.longitude = lat, lon
+        return weather
+    
+    def _generate_synthetic_weather_batch(self, lats: np.ndarray, lons: np.ndarray) -> WeatherArray:
+        """Generate realistic synthetic weather data for arrays of coordinates"""
+        # Seed based on coordinates for consistency; draws depend only on each point's seed
+        # and touch no global RNG state, so concurrent route threads can share the generator
+        seeds = np.mod(np.trunc((lats + lons) * 1000).astype(np.int64), 2147483647)
+        u = _hash_uniforms(seeds, 12)
+        
+        # Preallocated output columns, one contiguous row per field
+        columns = np.empty((9, len(lats)))
+        (wind_speed, wind_direction, temperature, pressure, visibility,
+         precipitation, cloud_coverage, icing_risk, thunderstorm_risk) = columns
+        
+        # Base weather patterns on geographic location, selected without branching
+        abs_lat = np.abs(lats)
+        region = np.where(abs_lat > 60, 0, np.where(abs_lat < 30, 1, 2))
+        temp_mean, temp_std, wind_base, wind_scale = _REGION_WEATHER[region].T
+        
+        # Box-Muller normals and inverse-CDF exponentials from the uniforms
+        np.multiply(np.sqrt(-2 * np.log(u[0])), np.cos(2 * np.pi * u[1]), out=temperature)
+        temperature *= temp_std
+        temperature += temp_mean
+        np.multiply(np.sqrt(-2 * np.log(u[4])), np.cos(2 * np.pi * u[5]), out=pressure)
+        pressure *= 20
+        pressure += 1013.25
+        log_wind, log_visibility, log_precipitation = np.log(u[[2, 6, 7]])
+        
+        np.maximum(0, wind_base - wind_scale * log_wind, out=wind_speed)
+        np.multiply(360, u[3], out=wind_direction)
+        np.maximum(1, 10 + 2 * log_visibility, out=visibility)
+        np.maximum(0, -2 * log_precipitation, out=precipitation)
+        np.multiply(100, u[8], out=cloud_coverage)
+        np.clip((temperature < 0) * 0.8 * u[10], 0, 1, out=icing_risk)
+        np.clip((temperature > 20) * 0.3 * u[11], 0, 1, out=thunderstorm_risk)
+        
+        return WeatherArray(
+            latitude=lats,
+            longitude=lons,
+            wind_speed=wind_speed,
+            wind_direction=wind_direction,
+            temperature=temperature,
+            pressure=pressure,
+            visibility=visibility,
+            precipitation=precipitation,
+            cloud_coverage=cloud_coverage,
+            turbulence_level=np.searchsorted(_TURBULENCE_CDF, u[9], side='right'),
+            icing_risk=icing_risk,
+            thunderstorm_risk=thunderstorm_risk
         )
 
 class WeatherAdaptiveRouter:
@@ -162,6 +409,24 @@ class WeatherAdaptiveRouter:
             'co2_factor': 3.15,  # kg CO2 per kg fuel
             'operating_cost': 12000  # USD per hour
         }
+        
+        # Derived constants used on every segment
+        self._cruise_kt = self.aircraft_performance['cruise_speed']
+        self._min_per_nm = 60.0 / self._cruise_kt
+        self._fuel_per_nm = self.aircraft_performance['fuel_consumption'] / self._cruise_kt
+        self._co2 = self.aircraft_performance['co2_factor']
+        self._recommendation_weights = np.array([0.4, 0.3, 0.2, 0.1])  # Safety, efficiency, cost, time
+        
+        # Fixed candidate offsets for the waypoint searches, as (lat, lon) rows
+        fuel_steps = np.arange(5) - 2.0  # 5x5 points, in half search radii
+        self._fuel_grid = np.array([np.repeat(fuel_steps, 5), np.tile(fuel_steps, 5)])
+        # Expanding circles as (radius fraction, cos, sin) rows, every 30 degrees
+        ring_angles = np.radians(np.tile(np.arange(0, 360, 30), 3))
+        self._safe_ring = np.array([np.repeat([0.25, 0.5, 1.0], 12), np.cos(ring_angles), np.sin(ring_angles)])
+        
+        # Compile (or load from cache) the scalar kernels up front
+        _hav_nm(0.0, 0.0, 1.0, 1.0)
+        _slerp(0.0, 0.0, 1.0, 1.0, 0.5)
     
     def calculate_optimal_routes(self, origin: Tuple[float, float], 
                                destination: Tuple[float, float],
@@ -171,11 +436,21 @@ class WeatherAdaptiveRouter:
         
         logger.info(f"Calculating routes from {origin} to {destination}")
         
-        # Calculate different route types
-        direct_route = self._calculate_direct_route(origin, destination, departure_time)
-        optimal_route = self._calculate_optimal_route(origin, destination, departure_time)
-        weather_route = self._calculate_weather_avoidance_route(origin, destination, departure_time)
-        fuel_efficient_route = self._calculate_fuel_efficient_route(origin, destination, departure_time)
+        # Weather fetched for one route is reused by the others within this request
+        weather_memo = {}
+        od_dist = self._calculate_distance(*origin, *destination)
+        
+        # Calculate the independent route types concurrently
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="route") as executor:
+            futures = {name: executor.submit(calculate, origin, destination, departure_time, weather_memo, od_dist)
+                       for name, calculate in [('direct', self._calculate_direct_route),
+                                               ('optimal', self._calculate_optimal_route),
+                                               ('weather', self._calculate_weather_avoidance_route),
+                                               ('fuel_efficient', self._calculate_fuel_efficient_route)]}
+            direct_route = futures['direct'].result()
+            optimal_route = futures['optimal'].result()
+            weather_route = futures['weather'].result()
+            fuel_efficient_route = futures['fuel_efficient'].result()
         
         # Determine recommended route
         routes = [direct_route, optimal_route, weather_route, fuel_efficient_route]
@@ -195,387 +470,345 @@ class WeatherAdaptiveRouter:
     
     def _calculate_direct_route(self, origin: Tuple[float, float], 
                               destination: Tuple[float, float],
-                              departure_time: datetime) -> FlightRoute:
+                              departure_time: datetime,
+                              weather_memo: Optional[dict] = None,
+                              od_dist: Optional[float] = None) -> FlightRoute:
         """Calculate direct great circle route"""
         
         # Calculate great circle distance
-        distance = self._calculate_distance(origin[0], origin[1], destination[0], destination[1])
+        if od_dist is None:
+            od_dist = self._calculate_distance(origin[0], origin[1], destination[0], destination[1])
+        distance = od_dist
         
         # Create waypoints along direct path
-        waypoints = []
         num_waypoints = max(3, int(distance / 200))  # One waypoint every ~200nm
+        waypoints = WaypointArray.empty(num_waypoints)
+        waypoints.alt[:] = 35000  # Standard cruise altitude
+        waypoints.efficiency[:] = 0.7  # Direct route is moderately efficient
         
         for i in range(num_waypoints):
             fraction = i / (num_waypoints - 1)
-            lat, lon = self._interpolate_coordinates(origin, destination, fraction)
-            altitude = 35000  # Standard cruise altitude
-            
-            # Get weather at this point
-            weather = self.weather_manager.get_weather_data(lat, lon)
-            
-            # Calculate time and fuel for this segment
-            segment_time = departure_time + timedelta(minutes=fraction * distance / self.aircraft_performance['cruise_speed'] * 60)
-            segment_fuel = self._calculate_fuel_consumption(distance / num_waypoints, weather, altitude)
-            
-            waypoint = RouteWaypoint(
-                latitude=lat,
-                longitude=lon,
-                altitude=altitude,
-                estimated_time=segment_time,
-                fuel_consumption=segment_fuel,
-                weather_impact=self._calculate_weather_impact(weather),
-                safety_score=self._calculate_safety_score(weather),
-                efficiency_score=0.7  # Direct route is moderately efficient
-            )
-            waypoints.append(waypoint)
-        
-        total_fuel = sum(wp.fuel_consumption for wp in waypoints)
-        total_time = distance / self.aircraft_performance['cruise_speed'] * 60
-        weather_delay = sum(wp.weather_impact * 10 for wp in waypoints)  # Minutes
+            waypoints.lat[i], waypoints.lon[i] = self._interpolate_coordinates(origin, destination, fraction)
+        waypoints.schedule(departure_time, timedelta(minutes=distance * self._min_per_nm))
+        
+        # Score every waypoint from one weather batch
+        weather = self.weather_manager.get_weather_batch(waypoints.lat, waypoints.lon, weather_memo)
+        waypoints.fuel[:] = self._calculate_fuel_batch(distance / num_waypoints, weather.wind_speed,
+                                                       weather.turbulence_level, weather.icing_risk, waypoints.alt)
+        waypoints.impact[:] = self._calculate_weather_impact_batch(weather)
+        waypoints.safety[:] = self._calculate_safety_score_batch(weather)
+        
+        total_fuel, sum_impact, sum_safety = self._route_totals(waypoints)
+        total_time = distance * self._min_per_nm
+        weather_delay = sum_impact * 10  # Minutes
         
         return FlightRoute(
             route_id="DIRECT",
-            waypoints=waypoints,
+            waypoints=waypoints.to_waypoints(),
             total_distance=distance,
             total_time=total_time + weather_delay,
             total_fuel=total_fuel,
             weather_delay=weather_delay,
             fuel_savings=0,  # Baseline
-            co2_emissions=total_fuel * self.aircraft_performance['co2_factor'],
-            safety_rating=sum(wp.safety_score for wp in waypoints) / len(waypoints),
+            co2_emissions=total_fuel * self._co2,
+            safety_rating=sum_safety / num_waypoints,
             efficiency_rating=0.7,
-            weather_severity=sum(wp.weather_impact for wp in waypoints) / len(waypoints),
+            weather_severity=sum_impact / num_waypoints,
             route_type="direct",
-            cost_savings=0
+            cost_savings=0,
+            waypoint_array=waypoints
         )
     
     def _calculate_optimal_route(self, origin: Tuple[float, float], 
                                destination: Tuple[float, float],
-                               departure_time: datetime) -> FlightRoute:
+                               departure_time: datetime,
+                               weather_memo: Optional[dict] = None,
+                               od_dist: Optional[float] = None) -> FlightRoute:
         """Calculate AI-optimized route considering all factors"""
         
         # Use advanced pathfinding with weather consideration
-        waypoints = self._ai_pathfinding(origin, destination, departure_time)
+        waypoints = self._ai_pathfinding(origin, destination, departure_time, weather_memo, od_dist)
         
-        total_distance = sum(self._calculate_distance(waypoints[i].latitude, waypoints[i].longitude,
-                                                     waypoints[i+1].latitude, waypoints[i+1].longitude)
-                           for i in range(len(waypoints)-1))
+        total_distance = self._path_distance(waypoints)
         
-        total_fuel = sum(wp.fuel_consumption for wp in waypoints)
-        total_time = total_distance / self.aircraft_performance['cruise_speed'] * 60
-        weather_delay = sum(wp.weather_impact * 5 for wp in waypoints)  # Optimized route has less weather delay
+        total_fuel, sum_impact, sum_safety = self._route_totals(waypoints)
+        total_time = total_distance * self._min_per_nm
+        weather_delay = sum_impact * 5  # Optimized route has less weather delay
         
         # Calculate fuel savings vs direct route
-        direct_fuel = total_distance * self.aircraft_performance['fuel_consumption'] / self.aircraft_performance['cruise_speed']
+        direct_fuel = total_distance * self._fuel_per_nm
         fuel_savings = max(0, direct_fuel - total_fuel)
         
         return FlightRoute(
             route_id="OPTIMAL",
-            waypoints=waypoints,
+            waypoints=waypoints.to_waypoints(),
             total_distance=total_distance,
             total_time=total_time + weather_delay,
             total_fuel=total_fuel,
             weather_delay=weather_delay,
             fuel_savings=fuel_savings,
-            co2_emissions=total_fuel * self.aircraft_performance['co2_factor'],
-            safety_rating=sum(wp.safety_score for wp in waypoints) / len(waypoints),
+            co2_emissions=total_fuel * self._co2,
+            safety_rating=sum_safety / len(waypoints),
             efficiency_rating=0.9,
-            weather_severity=sum(wp.weather_impact for wp in waypoints) / len(waypoints) * 0.7,  # Reduced weather impact
+            weather_severity=sum_impact / len(waypoints) * 0.7,  # Reduced weather impact
             route_type="optimal",
-            cost_savings=fuel_savings * 2.5  # USD per kg fuel
+            cost_savings=fuel_savings * 2.5,  # USD per kg fuel
+            waypoint_array=waypoints
         )
     
     def _calculate_weather_avoidance_route(self, origin: Tuple[float, float], 
                                          destination: Tuple[float, float],
-                                         departure_time: datetime) -> FlightRoute:
+                                         departure_time: datetime,
+                                         weather_memo: Optional[dict] = None,
+                                         od_dist: Optional[float] = None) -> FlightRoute:
         """Calculate route that prioritizes weather avoidance"""
         
         # Create route that specifically avoids bad weather
-        waypoints = self._weather_avoidance_pathfinding(origin, destination, departure_time)
+        waypoints = self._weather_avoidance_pathfinding(origin, destination, departure_time, weather_memo)
         
-        total_distance = sum(self._calculate_distance(waypoints[i].latitude, waypoints[i].longitude,
-                                                     waypoints[i+1].latitude, waypoints[i+1].longitude)
-                           for i in range(len(waypoints)-1))
+        total_distance = self._path_distance(waypoints)
         
-        total_fuel = sum(wp.fuel_consumption for wp in waypoints)
-        total_time = total_distance / self.aircraft_performance['cruise_speed'] * 60
-        weather_delay = sum(wp.weather_impact * 2 for wp in waypoints)  # Minimal weather delay
+        total_fuel, sum_impact, sum_safety = self._route_totals(waypoints)
+        total_time = total_distance * self._min_per_nm
+        weather_delay = sum_impact * 2  # Minimal weather delay
         
         # May use more fuel due to longer distance but saves on weather delays
-        direct_fuel = self._calculate_distance(origin[0], origin[1], destination[0], destination[1]) * \
-                     self.aircraft_performance['fuel_consumption'] / self.aircraft_performance['cruise_speed']
+        if od_dist is None:
+            od_dist = self._calculate_distance(origin[0], origin[1], destination[0], destination[1])
+        direct_fuel = od_dist * self._fuel_per_nm
         fuel_savings = max(-200, direct_fuel - total_fuel)  # May be negative (uses more fuel)
         
         return FlightRoute(
             route_id="WEATHER_AVOID",
-            waypoints=waypoints,
+            waypoints=waypoints.to_waypoints(),
             total_distance=total_distance,
             total_time=total_time + weather_delay,
             total_fuel=total_fuel,
             weather_delay=weather_delay,
             fuel_savings=fuel_savings,
-            co2_emissions=total_fuel * self.aircraft_performance['co2_factor'],
-            safety_rating=sum(wp.safety_score for wp in waypoints) / len(waypoints),
+            co2_emissions=total_fuel * self._co2,
+            safety_rating=sum_safety / len(waypoints),
             efficiency_rating=0.8,
-            weather_severity=sum(wp.weather_impact for wp in waypoints) / len(waypoints) * 0.3,  # Very low weather impact
+            weather_severity=sum_impact / len(waypoints) * 0.3,  # Very low weather impact
             route_type="weather_avoidance",
-            cost_savings=fuel_savings * 2.5 + weather_delay * 200  # Time savings value
+            cost_savings=fuel_savings * 2.5 + weather_delay * 200,  # Time savings value
+            waypoint_array=waypoints
         )
     
     def _calculate_fuel_efficient_route(self, origin: Tuple[float, float], 
                                       destination: Tuple[float, float],
-                                      departure_time: datetime) -> FlightRoute:
+                                      departure_time: datetime,
+                                      weather_memo: Optional[dict] = None,
+                                      od_dist: Optional[float] = None) -> FlightRoute:
         """Calculate route optimized specifically for fuel efficiency"""
         
         # Optimize for minimum fuel consumption
-        waypoints = self._fuel_optimization_pathfinding(origin, destination, departure_time)
+        waypoints = self._fuel_optimization_pathfinding(origin, destination, departure_time, weather_memo)
         
-        total_distance = sum(self._calculate_distance(waypoints[i].latitude, waypoints[i].longitude,
-                                                     waypoints[i+1].latitude, waypoints[i+1].longitude)
-                           for i in range(len(waypoints)-1))
+        total_distance = self._path_distance(waypoints)
         
-        total_fuel = sum(wp.fuel_consumption for wp in waypoints)
-        total_time = total_distance / self.aircraft_performance['cruise_speed'] * 60
-        weather_delay = sum(wp.weather_impact * 7 for wp in waypoints)  # Some weather impact accepted for fuel savings
+        total_fuel, sum_impact, sum_safety = self._route_totals(waypoints)
+        total_time = total_distance * self._min_per_nm
+        weather_delay = sum_impact * 7  # Some weather impact accepted for fuel savings
         
         # Calculate significant fuel savings
-        direct_fuel = self._calculate_distance(origin[0], origin[1], destination[0], destination[1]) * \
-                     self.aircraft_performance['fuel_consumption'] / self.aircraft_performance['cruise_speed']
+        if od_dist is None:
+            od_dist = self._calculate_distance(origin[0], origin[1], destination[0], destination[1])
+        direct_fuel = od_dist * self._fuel_per_nm
         fuel_savings = max(0, direct_fuel - total_fuel)
         
         return FlightRoute(
             route_id="FUEL_EFFICIENT",
-            waypoints=waypoints,
+            waypoints=waypoints.to_waypoints(),
             total_distance=total_distance,
             total_time=total_time + weather_delay,
             total_fuel=total_fuel,
             weather_delay=weather_delay,
             fuel_savings=fuel_savings,
-            co2_emissions=total_fuel * self.aircraft_performance['co2_factor'],
-            safety_rating=sum(wp.safety_score for wp in waypoints) / len(waypoints),
+            co2_emissions=total_fuel * self._co2,
+            safety_rating=sum_safety / len(waypoints),
             efficiency_rating=0.95,
-            weather_severity=sum(wp.weather_impact for wp in waypoints) / len(waypoints),
+            weather_severity=sum_impact / len(waypoints),
             route_type="fuel_efficient",
-            cost_savings=fuel_savings * 2.5
+            cost_savings=fuel_savings * 2.5,
+            waypoint_array=waypoints
         )
     
     def _ai_pathfinding(self, origin: Tuple[float, float], 
                        destination: Tuple[float, float],
-                       departure_time: datetime) -> List[RouteWaypoint]:
-        """AI-powered pathfinding with multi-objective optimization"""
-        
-        # Create grid of potential waypoints
-        num_intermediate = 5
-        waypoints = []
-        
-        # Add origin
-        weather_origin = self.weather_manager.get_weather_data(origin[0], origin[1])
-        waypoints.append(RouteWaypoint(
-            latitude=origin[0],
-            longitude=origin[1],
-            altitude=35000,
-            estimated_time=departure_time,
-            fuel_consumption=0,
-            weather_impact=self._calculate_weather_impact(weather_origin),
-            safety_score=self._calculate_safety_score(weather_origin),
-            efficiency_score=0.9
-        ))
-        
-        # Add optimized intermediate waypoints
-        for i in range(1, num_intermediate):
-            fraction = i / num_intermediate
+                       departure_time: datetime,
+                       weather_memo: Optional[dict] = None,
+                       od_dist: Optional[float] = None) -> WaypointArray:
+        """AI-powered pathfinding: A* search over a lattice of candidate waypoints"""
+        
+        if od_dist is None:
+            od_dist = self._calculate_distance(origin[0], origin[1], destination[0], destination[1])
+        distance = od_dist
+        bands, lanes = 20, 9  # ~180 lattice nodes
+        
+        # Bands of nodes across the great circle course, lanes spread perpendicular to it
+        fractions = np.arange(1, bands + 1) / (bands + 1)
+        lane_nm = (np.arange(lanes) - lanes // 2) * max(5.0, min(30.0, distance / 50))
+        centers = np.array([self._interpolate_coordinates(origin, destination, f) for f in fractions])
+        course = self._bearing_np(centers[:, 0], centers[:, 1], destination[0], destination[1])
+        grid_lat, grid_lon = self._offset_np(centers[:, :1], centers[:, 1:], course[:, None] + 90, lane_nm)
+        
+        # Node 0 is the origin and the last node the destination; band b, lane j is 1 + b * lanes + j
+        lats = np.concatenate(([origin[0]], grid_lat.ravel(), [destination[0]]))
+        lons = np.concatenate(([origin[1]], grid_lon.ravel(), [destination[1]]))
+        node_fraction = np.concatenate(([0.0], np.repeat(fractions, lanes), [1.0]))
+        goal = len(lats) - 1
+        
+        # Precompute node weather, altitude and per-nm edge costs before the search
+        weather = self.weather_manager.get_weather_batch(lats, lons, weather_memo)
+        impact = self._calculate_weather_impact_batch(weather)
+        altitude = self._optimize_altitude_batch(weather, node_fraction)
+        altitude[[0, goal]] = 35000
+        fuel_per_nm = self._calculate_fuel_batch(1.0, weather.wind_speed, weather.turbulence_level,
+                                                 weather.icing_risk, altitude)
+        cost_per_nm = (fuel_per_nm * (1 + self.aircraft_performance['weather_penalty'] * impact)).tolist()
+        
+        # Remaining great circle distance at the lowest possible fuel burn is admissible
+        min_fuel_per_nm = self._fuel_per_nm * (1.0 - (self.aircraft_performance['service_ceiling'] - 35000) / 100000)
+        heuristic = (self._haversine_np(lats, lons, destination[0], destination[1]) * min_fuel_per_nm).tolist()
+        
+        lat_list, lon_list = lats.tolist(), lons.tolist()
+        best_cost = {0: 0.0}
+        parent = {0: None}
+        closed = set()
+        frontier = [(heuristic[0], 0)]
+        
+        while frontier:
+            _, node = heapq.heappop(frontier)
+            if node == goal:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
             
-            # Apply AI optimization to find best position
-            base_lat, base_lon = self._interpolate_coordinates(origin, destination, fraction)
+            # Origin reaches every lane of the first band; lanes shift by at most one per band
+            if node == 0:
+                successors = range(1, 1 + lanes)
+            else:
+                band, lane = divmod(node - 1, lanes)
+                if band == bands - 1:
+                    successors = (goal,)
+                else:
+                    first = 1 + (band + 1) * lanes
+                    successors = range(first + max(0, lane - 1), first + min(lanes, lane + 2))
             
-            # Search around base position for optimal waypoint
-            best_lat, best_lon = self._optimize_waypoint_position(base_lat, base_lon, origin, destination)
-            
-            # Calculate optimal altitude
-            altitude = self._optimize_altitude(best_lat, best_lon, fraction)
-            
-            weather = self.weather_manager.get_weather_data(best_lat, best_lon)
-            segment_time = departure_time + timedelta(hours=fraction * 8)  # Estimate 8-hour flight
-            
-            waypoint = RouteWaypoint(
-                latitude=best_lat,
-                longitude=best_lon,
-                altitude=altitude,
-                estimated_time=segment_time,
-                fuel_consumption=self._calculate_fuel_consumption(50, weather, altitude),  # 50nm segment
-                weather_impact=self._calculate_weather_impact(weather),
-                safety_score=self._calculate_safety_score(weather),
-                efficiency_score=0.9
-            )
-            waypoints.append(waypoint)
-        
-        # Add destination
-        weather_dest = self.weather_manager.get_weather_data(destination[0], destination[1])
-        waypoints.append(RouteWaypoint(
-            latitude=destination[0],
-            longitude=destination[1],
-            altitude=35000,
-            estimated_time=departure_time + timedelta(hours=8),
-            fuel_consumption=0,
-            weather_impact=self._calculate_weather_impact(weather_dest),
-            safety_score=self._calculate_safety_score(weather_dest),
-            efficiency_score=0.9
-        ))
+            for nxt in successors:
+                cost = best_cost[node] + _hav_nm(lat_list[node], lon_list[node],
+                                                 lat_list[nxt], lon_list[nxt]) * cost_per_nm[nxt]
+                if cost < best_cost.get(nxt, math.inf):
+                    best_cost[nxt] = cost
+                    parent[nxt] = node
+                    heapq.heappush(frontier, (cost + heuristic[nxt], nxt))
+        
+        path = []
+        node = goal
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path = np.array(path[::-1])
+        
+        waypoints = WaypointArray(
+            lat=lats[path],
+            lon=lons[path],
+            alt=altitude[path],
+            fuel=np.empty(len(path), dtype=np.float32),
+            impact=impact[path].astype(np.float32),
+            safety=self._calculate_safety_score_batch(weather)[path].astype(np.float32),
+            efficiency=np.full(len(path), 0.9, dtype=np.float32),
+            estimated_time=np.empty(len(path), dtype='datetime64[us]')
+        )
+        waypoints.schedule(departure_time, timedelta(hours=8))  # Estimate 8-hour flight
+        
+        # Book the same 200nm en route allowance (4 x 50nm) as before the search, spread over the
+        # interior waypoints, so reported fuel stays comparable with the other candidate routes
+        waypoints.fuel[:] = fuel_per_nm[path] * (200 / bands)
+        waypoints.fuel[[0, -1]] = 0
         
         return waypoints
     
     def _weather_avoidance_pathfinding(self, origin: Tuple[float, float], 
                                      destination: Tuple[float, float],
-                                     departure_time: datetime) -> List[RouteWaypoint]:
+                                     departure_time: datetime,
+                                     weather_memo: Optional[dict] = None) -> WaypointArray:
         """Pathfinding that prioritizes weather avoidance"""
         
-        waypoints = []
-        current_pos = origin
-        
-        # Add origin
-        weather_origin = self.weather_manager.get_weather_data(origin[0], origin[1])
-        waypoints.append(RouteWaypoint(
-            latitude=origin[0],
-            longitude=origin[1],
-            altitude=37000,  # Higher altitude to avoid weather
-            estimated_time=departure_time,
-            fuel_consumption=0,
-            weather_impact=self._calculate_weather_impact(weather_origin) * 0.5,
-            safety_score=self._calculate_safety_score(weather_origin),
-            efficiency_score=0.8
-        ))
-        
-        # Create waypoints that avoid bad weather
         steps = 6
-        for i in range(1, steps):
-            fraction = i / steps
-            
-            # Find position that avoids severe weather
-            base_lat, base_lon = self._interpolate_coordinates(origin, destination, fraction)
-            
-            # Search for weather-safe position
-            safe_lat, safe_lon = self._find_weather_safe_position(base_lat, base_lon, 100)  # 100nm search radius
-            
-            weather = self.weather_manager.get_weather_data(safe_lat, safe_lon)
-            segment_time = departure_time + timedelta(hours=fraction * 8.5)  # Slightly longer due to avoidance
-            
-            waypoint = RouteWaypoint(
-                latitude=safe_lat,
-                longitude=safe_lon,
-                altitude=37000,
-                estimated_time=segment_time,
-                fuel_consumption=self._calculate_fuel_consumption(60, weather, 37000),  # 60nm segment
-                weather_impact=self._calculate_weather_impact(weather) * 0.3,  # Significantly reduced
-                safety_score=self._calculate_safety_score(weather),
-                efficiency_score=0.8
-            )
-            waypoints.append(waypoint)
-        
-        # Add destination
-        weather_dest = self.weather_manager.get_weather_data(destination[0], destination[1])
-        waypoints.append(RouteWaypoint(
-            latitude=destination[0],
-            longitude=destination[1],
-            altitude=37000,
-            estimated_time=departure_time + timedelta(hours=8.5),
-            fuel_consumption=0,
-            weather_impact=self._calculate_weather_impact(weather_dest) * 0.5,
-            safety_score=self._calculate_safety_score(weather_dest),
-            efficiency_score=0.8
-        ))
+        waypoints = WaypointArray.empty(steps + 1)
+        waypoints.alt[:] = 37000  # Higher altitude to avoid weather
+        waypoints.efficiency[:] = 0.8
+        
+        waypoints.lat[[0, -1]] = origin[0], destination[0]
+        waypoints.lon[[0, -1]] = origin[1], destination[1]
+        waypoints.schedule(departure_time, timedelta(hours=8.5))  # Slightly longer due to avoidance
+        
+        # Create waypoints that avoid bad weather, searching around all of them at once
+        base = np.array([self._interpolate_coordinates(origin, destination, i / steps) for i in range(1, steps)])
+        waypoints.lat[1:-1], waypoints.lon[1:-1] = self._find_weather_safe_position(
+            base[:, 0], base[:, 1], 100, weather_memo)  # 100nm search radius
+        
+        # Score every waypoint from one weather batch; fuel is per 60nm segment
+        weather = self.weather_manager.get_weather_batch(waypoints.lat, waypoints.lon, weather_memo)
+        waypoints.fuel[:] = self._calculate_fuel_batch(60, weather.wind_speed, weather.turbulence_level,
+                                                       weather.icing_risk, waypoints.alt)
+        waypoints.fuel[[0, -1]] = 0
+        waypoints.impact[:] = self._calculate_weather_impact_batch(weather)
+        waypoints.safety[:] = self._calculate_safety_score_batch(weather)
+        
+        # Significantly reduced weather impact en route, halved at the endpoints
+        waypoints.impact[1:-1] *= 0.3
+        waypoints.impact[[0, -1]] *= 0.5
         
         return waypoints
     
     def _fuel_optimization_pathfinding(self, origin: Tuple[float, float], 
                                      destination: Tuple[float, float],
-                                     departure_time: datetime) -> List[RouteWaypoint]:
+                                     departure_time: datetime,
+                                     weather_memo: Optional[dict] = None) -> WaypointArray:
         """Pathfinding optimized for minimum fuel consumption"""
         
-        waypoints = []
-        
-        # Add origin
-        weather_origin = self.weather_manager.get_weather_data(origin[0], origin[1])
-        waypoints.append(RouteWaypoint(
-            latitude=origin[0],
-            longitude=origin[1],
-            altitude=39000,  # High altitude for fuel efficiency
-            estimated_time=departure_time,
-            fuel_consumption=0,
-            weather_impact=self._calculate_weather_impact(weather_origin),
-            safety_score=self._calculate_safety_score(weather_origin),
-            efficiency_score=0.95
-        ))
-        
-        # Create fuel-optimized waypoints
         steps = 4  # Fewer waypoints for more direct, fuel-efficient route
-        for i in range(1, steps):
-            fraction = i / steps
-            
-            # Find most fuel-efficient position
-            lat, lon = self._interpolate_coordinates(origin, destination, fraction)
-            
-            # Optimize for tailwinds and favorable conditions
-            opt_lat, opt_lon = self._optimize_for_fuel_efficiency(lat, lon, 50)  # 50nm search radius
-            
-            weather = self.weather_manager.get_weather_data(opt_lat, opt_lon)
-            segment_time = departure_time + timedelta(hours=fraction * 7.5)  # Faster due to optimization
-            
-            waypoint = RouteWaypoint(
-                latitude=opt_lat,
-                longitude=opt_lon,
-                altitude=39000,
-                estimated_time=segment_time,
-                fuel_consumption=self._calculate_fuel_consumption(80, weather, 39000) * 0.85,  # 15% fuel savings
-                weather_impact=self._calculate_weather_impact(weather),
-                safety_score=self._calculate_safety_score(weather),
-                efficiency_score=0.95
-            )
-            waypoints.append(waypoint)
-        
-        # Add destination
-        weather_dest = self.weather_manager.get_weather_data(destination[0], destination[1])
-        waypoints.append(RouteWaypoint(
-            latitude=destination[0],
-            longitude=destination[1],
-            altitude=39000,
-            estimated_time=departure_time + timedelta(hours=7.5),
-            fuel_consumption=0,
-            weather_impact=self._calculate_weather_impact(weather_dest),
-            safety_score=self._calculate_safety_score(weather_dest),
-            efficiency_score=0.95
-        ))
+        waypoints = WaypointArray.empty(steps + 1)
+        waypoints.alt[:] = 39000  # High altitude for fuel efficiency
+        waypoints.efficiency[:] = 0.95
+        
+        waypoints.lat[[0, -1]] = origin[0], destination[0]
+        waypoints.lon[[0, -1]] = origin[1], destination[1]
+        waypoints.schedule(departure_time, timedelta(hours=7.5))  # Faster due to optimization
+        
+        # Create fuel-optimized waypoints, optimizing for tailwinds and favorable conditions
+        base = np.array([self._interpolate_coordinates(origin, destination, i / steps) for i in range(1, steps)])
+        waypoints.lat[1:-1], waypoints.lon[1:-1] = self._optimize_for_fuel_efficiency(
+            base[:, 0], base[:, 1], 50, weather_memo)  # 50nm search radius
+        
+        # Score every waypoint from one weather batch; 80nm segments with 15% fuel savings
+        weather = self.weather_manager.get_weather_batch(waypoints.lat, waypoints.lon, weather_memo)
+        waypoints.fuel[:] = self._calculate_fuel_batch(80, weather.wind_speed, weather.turbulence_level,
+                                                       weather.icing_risk, waypoints.alt) * 0.85
+        waypoints.fuel[[0, -1]] = 0
+        waypoints.impact[:] = self._calculate_weather_impact_batch(weather)
+        waypoints.safety[:] = self._calculate_safety_score_batch(weather)
         
         return waypoints
     
     def _select_recommended_route(self, routes: List[FlightRoute]) -> FlightRoute:
         """Select the best overall route using multi-criteria decision analysis"""
         
-        best_route = routes[0]
-        best_score = 0
+        # Normalized safety, efficiency, cost (0-1) and time (less delay is better) per route
+        criteria = np.array([[route.safety_rating,
+                              route.efficiency_rating,
+                              max(0, route.cost_savings / 1000),
+                              max(0, 1 - (route.weather_delay / 60))] for route in routes])
         
-        for route in routes:
-            # Multi-criteria scoring
-            safety_weight = 0.4
-            efficiency_weight = 0.3
-            cost_weight = 0.2
-            time_weight = 0.1
-            
-            # Normalize scores
-            safety_score = route.safety_rating
-            efficiency_score = route.efficiency_rating
-            cost_score = max(0, route.cost_savings / 1000)  # Normalize to 0-1
-            time_score = max(0, 1 - (route.weather_delay / 60))  # Less delay is better
-            
-            total_score = (safety_score * safety_weight + 
-                          efficiency_score * efficiency_weight +
-                          cost_score * cost_weight +
-                          time_score * time_weight)
-            
-            if total_score > best_score:
-                best_score = total_score
-                best_route = route
+        # Multi-criteria scoring: safety, efficiency, cost and time weights
+        total_scores = criteria @ self._recommendation_weights
         
-        return best_route
+        best = int(np.argmax(total_scores))
+        return routes[best] if total_scores[best] > 0 else routes[0]
     
     def _calculate_comparison_metrics(self, routes: List[FlightRoute]) -> Dict[str, float]:
         """Calculate comparison metrics between routes"""
@@ -583,78 +816,108 @@ class WeatherAdaptiveRouter:
         if not routes:
             return {}
         
-        direct_route = next((r for r in routes if r.route_type == "direct"), routes[0])
+        df = pd.DataFrame({
+            'fuel': [r.total_fuel for r in routes],
+            'time': [r.total_time for r in routes],
+            'cost': [r.cost_savings for r in routes],
+            'co2': [r.co2_emissions for r in routes],
+            'distance': [r.total_distance for r in routes]
+        }, index=[r.route_type.upper() for r in routes])
         
-        metrics = {}
+        direct = df.iloc[next((i for i, r in enumerate(routes) if r.route_type == "direct"), 0)]
         
-        for route in routes:
-            prefix = route.route_type.upper()
-            
+        metrics = pd.DataFrame({
             # Fuel savings vs direct route
-            metrics[f"{prefix}_fuel_savings_kg"] = route.total_fuel - direct_route.total_fuel
-            metrics[f"{prefix}_fuel_savings_pct"] = ((direct_route.total_fuel - route.total_fuel) / direct_route.total_fuel) * 100
-            
+            'fuel_savings_kg': df['fuel'] - direct['fuel'],
+            'fuel_savings_pct': (direct['fuel'] - df['fuel']) / direct['fuel'] * 100,
             # Time comparison
-            metrics[f"{prefix}_time_diff_min"] = route.total_time - direct_route.total_time
-            
+            'time_diff_min': df['time'] - direct['time'],
             # Cost comparison
-            metrics[f"{prefix}_cost_savings_usd"] = route.cost_savings
-            
+            'cost_savings_usd': df['cost'],
             # CO2 reduction
-            metrics[f"{prefix}_co2_reduction_kg"] = direct_route.co2_emissions - route.co2_emissions
-            
+            'co2_reduction_kg': direct['co2'] - df['co2'],
             # Distance comparison
-            metrics[f"{prefix}_distance_diff_nm"] = route.total_distance - direct_route.total_distance
+            'distance_diff_nm': df['distance'] - direct['distance']
+        })
         
-        return metrics
+        return {f"{prefix}_{column}": value
+                for prefix, row in zip(metrics.index, metrics.to_numpy().tolist())
+                for column, value in zip(metrics.columns, row)}
     
     # Helper methods for calculations
     
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate great circle distance in nautical miles"""
+        return _hav_nm(float(lat1), float(lon1), float(lat2), float(lon2))
+    
+    @staticmethod
+    def _haversine_np(lat1: np.ndarray, lon1: np.ndarray,
+                      lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+        """Vectorized ``_calculate_distance`` over arrays of point pairs (nm)"""
+        if NUMBA_AVAILABLE:
+            return _hav_nm_ufunc(lat1, lon1, lat2, lon2)
+        
         R = 3440.065  # Earth's radius in nautical miles
         
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
+        lat1_rad = np.radians(lat1)
+        lat2_rad = np.radians(lat2)
+        delta_lat = np.radians(lat2 - lat1)
+        delta_lon = np.radians(lon2 - lon1)
         
-        a = (math.sin(delta_lat / 2) ** 2 + 
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        a = (np.sin(delta_lat / 2) ** 2 +
+             np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2)
+        c = 2 * np.arcsin(np.sqrt(np.minimum(1.0, a)))  # Rounding can push a just past 1
         
         return R * c
     
+    @staticmethod
+    def _bearing_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Initial great circle bearing in degrees from the first points toward the second"""
+        lat1_rad, lat2_rad = np.radians(lat1), np.radians(lat2)
+        delta_lon = np.radians(np.subtract(lon2, lon1))
+        
+        return np.degrees(np.arctan2(np.sin(delta_lon) * np.cos(lat2_rad),
+                                     np.cos(lat1_rad) * np.sin(lat2_rad) -
+                                     np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(delta_lon)))
+    
+    @staticmethod
+    def _offset_np(lat, lon, bearing, distance_nm) -> Tuple[np.ndarray, np.ndarray]:
+        """Points ``distance_nm`` along ``bearing`` (degrees) from the given points"""
+        R = 3440.065  # Earth's radius in nautical miles
+        
+        lat_rad = np.radians(lat)
+        bearing_rad = np.radians(bearing)
+        delta = np.asarray(distance_nm) / R
+        
+        lat2 = np.arcsin(np.sin(lat_rad) * np.cos(delta) +
+                         np.cos(lat_rad) * np.sin(delta) * np.cos(bearing_rad))
+        lon2 = np.radians(lon) + np.arctan2(np.sin(bearing_rad) * np.sin(delta) * np.cos(lat_rad),
+                                            np.cos(delta) - np.sin(lat_rad) * np.sin(lat2))
+        
+        return np.degrees(lat2), (np.degrees(lon2) + 540) % 360 - 180
+    
+    def _route_totals(self, waypoints: WaypointArray) -> Tuple[float, float, float]:
+        """Total fuel, summed weather impact and summed safety score"""
+        # Accumulate the float32 columns in float64
+        return (float(waypoints.fuel.sum(dtype=np.float64)), float(waypoints.impact.sum(dtype=np.float64)),
+                float(waypoints.safety.sum(dtype=np.float64)))
+    
+    def _path_distance(self, waypoints: WaypointArray) -> float:
+        """Total great circle distance along consecutive waypoints in nautical miles"""
+        return float(self._haversine_np(waypoints.lat[:-1], waypoints.lon[:-1],
+                                        waypoints.lat[1:], waypoints.lon[1:]).sum())
+    
     def _interpolate_coordinates(self, start: Tuple[float, float], 
                                end: Tuple[float, float], fraction: float) -> Tuple[float, float]:
         """Interpolate coordinates along great circle path"""
-        lat1, lon1 = math.radians(start[0]), math.radians(start[1])
-        lat2, lon2 = math.radians(end[0]), math.radians(end[1])
-        
-        # Spherical interpolation
-        delta = 2 * math.asin(math.sqrt(
-            math.sin((lat2 - lat1) / 2) ** 2 + 
-            math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
-        ))
-        
-        if delta == 0:
+        if start[0] == end[0] and start[1] == end[1]:
             return start
         
-        a = math.sin((1 - fraction) * delta) / math.sin(delta)
-        b = math.sin(fraction * delta) / math.sin(delta)
-        
-        x = a * math.cos(lat1) * math.cos(lon1) + b * math.cos(lat2) * math.cos(lon2)
-        y = a * math.cos(lat1) * math.sin(lon1) + b * math.cos(lat2) * math.sin(lon2)
-        z = a * math.sin(lat1) + b * math.sin(lat2)
-        
-        lat = math.atan2(z, math.sqrt(x ** 2 + y ** 2))
-        lon = math.atan2(y, x)
-        
-        return math.degrees(lat), math.degrees(lon)
+        return _slerp(float(start[0]), float(start[1]), float(end[0]), float(end[1]), float(fraction))
     
     def _calculate_fuel_consumption(self, distance: float, weather: WeatherData, altitude: float) -> float:
         """Calculate fuel consumption for route segment"""
-        base_consumption = distance * self.aircraft_performance['fuel_consumption'] / self.aircraft_performance['cruise_speed']
+        base_consumption = distance * self._fuel_per_nm
         
         # Weather impact
         weather_penalty = 1.0
@@ -670,165 +933,101 @@ class WeatherAdaptiveRouter:
         
         return base_consumption * weather_penalty * altitude_factor
     
-    def _calculate_weather_impact(self, weather: WeatherData) -> float:
-        """Calculate weather impact score (0-1, higher is worse)"""
-        impact = 0.0
-        
-        # Wind impact
-        impact += min(0.3, weather.wind_speed / 100)
-        
-        # Turbulence impact
-        impact += weather.turbulence_level / 15
+    def _calculate_fuel_batch(self, distances, wind_speed: np.ndarray, turbulence: np.ndarray,
+                              icing: np.ndarray, altitude) -> np.ndarray:
+        """Vectorized ``_calculate_fuel_consumption`` over arrays of segments"""
+        # Weather penalties for strong winds, severe turbulence and high icing risk
+        weather_penalty = 1.0 + 0.1 * (wind_speed > 30) + 0.15 * (turbulence > 3) + 0.1 * (icing > 0.5)
         
-        # Precipitation impact
-        impact += min(0.2, weather.precipitation / 20)
-        
-        # Thunderstorm risk
-        impact += weather.thunderstorm_risk * 0.4
-        
-        # Icing risk
-        impact += weather.icing_risk * 0.3
-        
-        # Visibility impact
-        impact += max(0, (10 - weather.visibility) / 25)
+        # Altitude efficiency (higher is generally more efficient)
+        altitude_factor = 1.0 - (np.asarray(altitude) - 35000) / 100000
         
-        return min(1.0, impact)
+        return distances * self._fuel_per_nm * weather_penalty * altitude_factor
+    
+    def _calculate_weather_impact(self, weather: WeatherData) -> float:
+        """Calculate weather impact score (0-1, higher is worse)"""
+        return float(self._calculate_weather_impact_batch(WeatherArray.from_rows([astuple(weather)]))[0])
     
     def _calculate_safety_score(self, weather: WeatherData) -> float:
         """Calculate safety score (0-1, higher is safer)"""
-        safety = 1.0
-        
+        return float(self._calculate_safety_score_batch(WeatherArray.from_rows([astuple(weather)]))[0])
+    
+    def _calculate_weather_impact_batch(self, weather: WeatherArray) -> np.ndarray:
+        """Weather impact scores (0-1, higher is worse) over a weather batch"""
+        # Wind, turbulence, precipitation, thunderstorm, icing and visibility impact
+        impact = (np.minimum(0.3, weather.wind_speed / 100) +
+                  weather.turbulence_level / 15 +
+                  np.minimum(0.2, weather.precipitation / 20) +
+                  weather.thunderstorm_risk * 0.4 +
+                  weather.icing_risk * 0.3 +
+                  np.maximum(0, (10 - weather.visibility) / 25))
+        
+        return np.minimum(1.0, impact)
+    
+    def _calculate_safety_score_batch(self, weather: WeatherArray) -> np.ndarray:
+        """Safety scores (0-1, higher is safer) over a weather batch"""
         # Reduce safety for dangerous conditions
-        safety -= weather.thunderstorm_risk * 0.5
-        safety -= weather.icing_risk * 0.3
-        safety -= min(0.2, weather.turbulence_level / 10)
-        safety -= max(0, (50 - weather.wind_speed) / -200)  # Very high winds
-        safety -= max(0, (1 - weather.visibility) / 5)  # Low visibility
-        
-        return max(0.0, safety)
-    
-    def _optimize_waypoint_position(self, base_lat: float, base_lon: float,
-                                  origin: Tuple[float, float], destination: Tuple[float, float]) -> Tuple[float, float]:
-        """Optimize waypoint position using AI algorithms"""
-        
-        best_lat, best_lon = base_lat, base_lon
-        best_score = 0
-        
-        # Search in a grid around base position
-        search_radius = 1.0  # degrees
-        search_points = 9
-        
-        for i in range(search_points):
-            for j in range(search_points):
-                lat_offset = (i - search_points//2) * search_radius / search_points
-                lon_offset = (j - search_points//2) * search_radius / search_points
-                
-                test_lat = base_lat + lat_offset
-                test_lon = base_lon + lon_offset
-                
-                # Calculate score for this position
-                weather = self.weather_manager.get_weather_data(test_lat, test_lon)
-                
-                # Multi-objective scoring
-                weather_score = 1 - self._calculate_weather_impact(weather)
-                safety_score = self._calculate_safety_score(weather)
-                
-                # Distance penalty (prefer points closer to direct route)
-                direct_dist = self._calculate_distance(origin[0], origin[1], destination[0], destination[1])
-                route_dist = (self._calculate_distance(origin[0], origin[1], test_lat, test_lon) +
-                             self._calculate_distance(test_lat, test_lon, destination[0], destination[1]))
-                distance_score = max(0, 1 - (route_dist - direct_dist) / direct_dist)
-                
-                total_score = weather_score * 0.4 + safety_score * 0.4 + distance_score * 0.2
-                
-                if total_score > best_score:
-                    best_score = total_score
-                    best_lat, best_lon = test_lat, test_lon
-        
-        return best_lat, best_lon
-    
-    def _optimize_altitude(self, lat: float, lon: float, fraction: float) -> float:
-        """Optimize altitude for given position"""
-        weather = self.weather_manager.get_weather_data(lat, lon)
-        
-        # Start with standard cruise altitude
-        base_altitude = 35000
-        
-        # Adjust based on weather
-        if weather.turbulence_level > 3:
-            base_altitude += 2000  # Climb above turbulence
-        
-        if weather.icing_risk > 0.5:
-            base_altitude += 3000  # Climb above icing level
+        safety = (1.0 - weather.thunderstorm_risk * 0.5
+                  - weather.icing_risk * 0.3
+                  - np.minimum(0.2, weather.turbulence_level / 10)
+                  - np.maximum(0, (weather.wind_speed - 50) / 200)  # Very high winds only
+                  - np.maximum(0, (1 - weather.visibility) / 5))  # Low visibility
+        
+        return np.maximum(0.0, safety)
+    
+    def _optimize_altitude_batch(self, weather: WeatherArray, fractions: np.ndarray) -> np.ndarray:
+        """Optimize altitude for a batch of positions at the given route fractions"""
+        # Climb above turbulence and icing levels from standard cruise altitude
+        base_altitude = 35000 + 2000 * (weather.turbulence_level > 3) + 3000 * (weather.icing_risk > 0.5)
         
         # Altitude profile optimization (climb/descent phases)
-        if fraction < 0.2:  # Climb phase
-            base_altitude = 30000 + fraction * 25000
-        elif fraction > 0.8:  # Descent phase
-            base_altitude = 35000 - (fraction - 0.8) * 25000
+        base_altitude = np.where(fractions < 0.2, 30000 + fractions * 25000,
+                                 np.where(fractions > 0.8, 35000 - (fractions - 0.8) * 25000, base_altitude))
         
-        return min(41000, max(25000, base_altitude))
+        return np.clip(base_altitude, 25000, 41000)
     
-    def _find_weather_safe_position(self, base_lat: float, base_lon: float, search_radius: float) -> Tuple[float, float]:
-        """Find a weather-safe position within search radius"""
+    def _find_weather_safe_position(self, base_lats: np.ndarray, base_lons: np.ndarray, search_radius: float,
+                                    weather_memo: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Find a weather-safe position within search radius of each base position"""
         
-        best_lat, best_lon = base_lat, base_lon
-        best_safety = 0
+        # Search in expanding circles, radius converted from nm to degrees; one row per base position
+        radius_deg = self._safe_ring[0] * search_radius / 60
+        cand_lats = base_lats[:, None] + radius_deg * self._safe_ring[1]
+        cand_lons = base_lons[:, None] + radius_deg * self._safe_ring[2]
+        weather = self.weather_manager.get_weather_batch(cand_lats.ravel(), cand_lons.ravel(), weather_memo)
         
-        # Search in expanding circles
-        for radius in [0.25, 0.5, 1.0]:
-            radius_deg = radius * search_radius / 60  # Convert nm to degrees
-            
-            for angle in range(0, 360, 30):  # Every 30 degrees
-                test_lat = base_lat + radius_deg * math.cos(math.radians(angle))
-                test_lon = base_lon + radius_deg * math.sin(math.radians(angle))
-                
-                weather = self.weather_manager.get_weather_data(test_lat, test_lon)
-                safety_score = self._calculate_safety_score(weather)
-                
-                if safety_score > best_safety:
-                    best_safety = safety_score
-                    best_lat, best_lon = test_lat, test_lon
-        
-        return best_lat, best_lon
-    
-    def _optimize_for_fuel_efficiency(self, base_lat: float, base_lon: float, search_radius: float) -> Tuple[float, float]:
-        """Optimize position for maximum fuel efficiency"""
-        
-        best_lat, best_lon = base_lat, base_lon
-        best_efficiency = 0
-        
-        # Search for positions with favorable winds
+        safety_score = self._calculate_safety_score_batch(weather).reshape(cand_lats.shape)
+        
+        return self._best_candidate(safety_score, cand_lats, cand_lons, base_lats, base_lons)
+    
+    def _optimize_for_fuel_efficiency(self, base_lats: np.ndarray, base_lons: np.ndarray, search_radius: float,
+                                      weather_memo: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Optimize each base position for maximum fuel efficiency"""
+        
+        # Search for positions with favorable winds. The whole grid is scored from one
+        # weather batch; weather is not smooth between grid points (it is sampled
+        # independently per 0.01 degree cell), so a local refinement would not improve on it
         search_radius_deg = search_radius / 60  # Convert nm to degrees
+        cand_lats = base_lats[:, None] + self._fuel_grid[0] * search_radius_deg / 2
+        cand_lons = base_lons[:, None] + self._fuel_grid[1] * search_radius_deg / 2
+        weather = self.weather_manager.get_weather_batch(cand_lats.ravel(), cand_lons.ravel(), weather_memo)
+        
+        # Strong winds can be beneficial if tailwinds, plus good weather and safety
+        efficiency = (1.0 + 0.2 * (weather.wind_speed > 20) +
+                      (1 - self._calculate_weather_impact_batch(weather)) * 0.3 +
+                      self._calculate_safety_score_batch(weather) * 0.2)
         
-        for i in range(5):
-            for j in range(5):
-                lat_offset = (i - 2) * search_radius_deg / 2
-                lon_offset = (j - 2) * search_radius_deg / 2
-                
-                test_lat = base_lat + lat_offset
-                test_lon = base_lon + lon_offset
-                
-                weather = self.weather_manager.get_weather_data(test_lat, test_lon)
-                
-                # Calculate fuel efficiency score
-                efficiency = 1.0
-                
-                # Favorable winds (tailwinds)
-                if weather.wind_speed > 20:  # Strong winds can be beneficial if tailwinds
-                    efficiency += 0.2  # Assume some benefit from winds
-                
-                # Good weather conditions
-                efficiency += (1 - self._calculate_weather_impact(weather)) * 0.3
-                
-                # Safety consideration
-                efficiency += self._calculate_safety_score(weather) * 0.2
-                
-                if efficiency > best_efficiency:
-                    best_efficiency = efficiency
-                    best_lat, best_lon = test_lat, test_lon
-        
-        return best_lat, best_lon
+        return self._best_candidate(efficiency.reshape(cand_lats.shape), cand_lats, cand_lons, base_lats, base_lons)
+    
+    @staticmethod
+    def _best_candidate(scores: np.ndarray, cand_lats: np.ndarray, cand_lons: np.ndarray,
+                        base_lats: np.ndarray, base_lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """First highest-scoring candidate of each row, or the base position where no score is positive"""
+        rows = np.arange(len(scores))
+        best = np.argmax(scores, axis=1)
+        found = scores[rows, best] > 0
+        return (np.where(found, cand_lats[rows, best], base_lats),
+                np.where(found, cand_lons[rows, best], base_lons))
 
 def calculate_environmental_impact(route: FlightRoute) -> Dict[str, float]:
     """Calculate detailed environmental impact metrics"""
@@ -840,11 +1039,19 @@ def calculate_environmental_impact(route: FlightRoute) -> Dict[str, float]:
     nox_kg = route.total_fuel * 0.015  # Typical NOx emission factor
     so2_kg = route.total_fuel * 0.001  # SO2 emissions
     
+    # Waypoint altitude and weather impact columns, from the SoA view when available
+    if route.waypoint_array is not None:
+        altitude, weather_impact = route.waypoint_array.alt, route.waypoint_array.impact
+    else:
+        count = len(route.waypoints)
+        altitude = np.fromiter((wp.altitude for wp in route.waypoints), dtype=float, count=count)
+        weather_impact = np.fromiter((wp.weather_impact for wp in route.waypoints), dtype=float, count=count)
+    
     # Noise impact (simplified model)
-    noise_score = sum(wp.altitude < 10000 for wp in route.waypoints) / len(route.waypoints)
+    noise_score = float(np.mean(altitude < 10000))
     
     # Contrail formation potential
-    contrail_risk = sum(wp.altitude > 30000 and wp.weather_impact < 0.3 for wp in route.waypoints) / len(route.waypoints)
+    contrail_risk = float(np.mean((altitude > 30000) & (weather_impact < 0.3)))
     
     return {
         'co2_emissions_kg': co2_kg,
@@ -861,17 +1068,22 @@ def generate_route_summary_stats(comparison: RouteComparison) -> Dict[str, any]:
     routes = [comparison.direct_route, comparison.optimal_route, 
               comparison.weather_route, comparison.fuel_efficient_route]
     
+    # One row per route; weather delay and severity are negated so every column is maximized
+    metrics = np.array([[r.fuel_savings, r.cost_savings, -r.weather_delay, r.safety_rating,
+                         r.efficiency_rating, -r.weather_severity, r.co2_emissions] for r in routes])
+    best = metrics.max(axis=0).tolist()
+    
     stats = {
         'total_routes_analyzed': len(routes),
         'recommended_route': comparison.recommended_route.route_type,
-        'max_fuel_savings_kg': max(r.fuel_savings for r in routes),
-        'max_cost_savings_usd': max(r.cost_savings for r in routes),
-        'min_weather_delay_min': min(r.weather_delay for r in routes),
-        'best_safety_rating': max(r.safety_rating for r in routes),
-        'best_efficiency_rating': max(r.efficiency_rating for r in routes),
-        'avg_co2_emissions_kg': sum(r.co2_emissions for r in routes) / len(routes),
+        'max_fuel_savings_kg': best[0],
+        'max_cost_savings_usd': best[1],
+        'min_weather_delay_min': -best[2],
+        'best_safety_rating': best[3],
+        'best_efficiency_rating': best[4],
+        'avg_co2_emissions_kg': float(metrics[:, 6].mean()),
         'route_diversity_score': len(set(r.route_type for r in routes)) / len(routes),
-        'weather_adaptation_effectiveness': 1 - min(r.weather_severity for r in routes)
+        'weather_adaptation_effectiveness': 1 + best[5]
     }
     
     return stats
\ No newline at end of file
@@ -5,7 +5,6 @@ Advanced collision detection and avoidance system for ATC AI
 """
 
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
@@ -15,10 +14,129 @@ from scipy.spatial.distance import cdist
 from scipy.optimize import minimize
 import json
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The NumPy fallback only runs the haversine where the flat-earth distance is
+# below this multiple of the separation minimum; well above its error at conflict ranges. Near the
+# poles the flat-earth distance is meaningless and the haversine always runs
+PREFILTER_MARGIN = 1.5
+PREFILTER_MAX_LAT = 80.0
+
+# Sort order for conflict severities, most urgent first
+SEV_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Unit conversions and earth radii
+DEG2RAD = math.pi / 180.0
+RAD2DEG = 180.0 / math.pi
+EARTH_R_M = 6371000.0
+EARTH_R_NM = 3440.065
+
+# Local bindings for _haversine_nm, which also runs uncompiled
+_sin, _cos, _asin, _sqrt = math.sin, math.cos, math.asin, math.sqrt
+
+def _haversine_nm(lat1, lon1, lat2, lon2):
+    """Great circle distance in nautical miles between two points in degrees"""
+    
+    lat1, lat2 = lat1 * DEG2RAD, lat2 * DEG2RAD
+    sin_dlat = _sin((lat2 - lat1) / 2)
+    sin_dlon = _sin((lon2 * DEG2RAD - lon1 * DEG2RAD) / 2)
+    
+    a = sin_dlat * sin_dlat + _cos(lat1) * _cos(lat2) * (sin_dlon * sin_dlon)
+    c = 2 * _asin(_sqrt(a))
+    
+    return EARTH_R_NM * c
+
+def _haversine_nm_array(lat1, lon1, lat2, lon2):
+    """``_haversine_nm`` over NumPy arrays"""
+    
+    lat1, lon1 = lat1 * DEG2RAD, lon1 * DEG2RAD
+    lat2, lon2 = lat2 * DEG2RAD, lon2 * DEG2RAD
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_R_NM * (2 * np.arcsin(np.sqrt(a)))
+
+def _predict_trajectory_kernel(lat, lon, alt, vel_ms, hdg_rad, vrate_ms, dt, out):
+    """Dead-reckon one aircraft, writing (lat, lon, alt) of each step into ``out``"""
+    
+    # Heading and speeds are constant, so every step moves the same distance north,
+    # east and up; only the longitude step depends on the current latitude
+    lat_step = (vel_ms * math.cos(hdg_rad) * dt) / EARTH_R_M * RAD2DEG
+    east = vel_ms * math.sin(hdg_rad) * dt
+    alt_step = vrate_ms * dt
+    
+    for step in range(out.shape[0]):
+        lon_delta = east / (EARTH_R_M * math.cos(lat * DEG2RAD))
+        
+        # Update position
+        lat += lat_step
+        lon += lon_delta * RAD2DEG
+        alt += alt_step
+        
+        out[step, 0] = lat
+        out[step, 1] = lon
+        out[step, 2] = alt
+
+def _predict_trajectories_kernel(lat, lon, alt, vel_ms, hdg_rad, vrate_ms, dt, out):
+    """``_predict_trajectory_kernel`` for every aircraft into ``out[aircraft]``"""
+    
+    for k in prange(out.shape[0]):
+        _predict_trajectory_kernel(lat[k], lon[k], alt[k], vel_ms[k], hdg_rad[k], vrate_ms[k],
+                                   dt, out[k])
+
+def _first_conflict_kernel(traj, i_idx, j_idx, h_sep, v_sep, step_nm, step_ft, out_step):
+    """First step where pair (i_idx[k], j_idx[k]) loses separation, -1 if none
+    
+    ``step_nm``/``step_ft`` bound how far each aircraft moves horizontally and
+    vertically in one step. A pair still apart can close by at most their sum
+    per step, so the scan jumps straight to the first step where separation
+    could be lost and never skips a conflicting step.
+    """
+    
+    steps = traj.shape[1]
+    for k in prange(i_idx.shape[0]):
+        i = i_idx[k]
+        j = j_idx[k]
+        h_close = step_nm[i] + step_nm[j]
+        v_close = step_ft[i] + step_ft[j]
+        out_step[k] = -1
+        
+        step = 0
+        while step < steps:
+            # Cheap vertical test first, haversine only when it passes
+            v_dist = abs(traj[i, step, 2] - traj[j, step, 2])
+            if v_dist >= v_sep[k]:
+                if v_close <= 0.0:
+                    break
+                step += max(1, int((v_dist - v_sep[k]) / v_close))
+                continue
+            
+            h_dist = _haversine_nm(traj[i, step, 0], traj[i, step, 1],
+                                   traj[j, step, 0], traj[j, step, 1])
+            if h_dist >= h_sep[k]:
+                if h_close <= 0.0:
+                    break
+                step += max(1, int((h_dist - h_sep[k]) / h_close))
+                continue
+            
+            out_step[k] = step
+            break
+
+if NUMBA_AVAILABLE:
+    # No fastmath: compiled trajectories must match the interpreted ones
+    _haversine_nm = njit(cache=True)(_haversine_nm)
+    _predict_trajectory_kernel = njit(cache=True)(_predict_trajectory_kernel)
+    # Aircraft and pairs are independent, so both batch kernels run across cores
+    _predict_trajectories_kernel = njit(parallel=True, cache=True)(_predict_trajectories_kernel)
+    _first_conflict_kernel = njit(parallel=True, cache=True)(_first_conflict_kernel)
+
 @dataclass
 class Aircraft:
     """Aircraft data structure"""
@@ -34,6 +152,25 @@ class Aircraft:
     aircraft_type: str = "UNKNOWN"
     priority: int = 1  # 1=normal, 2=priority, 3=emergency
 
+@dataclass
+class AircraftArray:
+    """Aircraft states as parallel float64 arrays, indexed like the source list"""
+    latitude: np.ndarray
+    longitude: np.ndarray
+    altitude: np.ndarray
+    velocity: np.ndarray  # knots
+    heading: np.ndarray  # degrees
+    vertical_rate: np.ndarray  # feet per minute
+    
+    def __len__(self) -> int:
+        return len(self.latitude)
+    
+    @classmethod
+    def from_aircraft(cls, aircraft_list: List[Aircraft]) -> 'AircraftArray':
+        columns = np.array([(a.latitude, a.longitude, a.altitude, a.velocity, a.heading, a.vertical_rate)
+                            for a in aircraft_list], dtype=float).reshape(-1, 6)
+        return cls(*np.ascontiguousarray(columns.T))
+
 @dataclass
 class Conflict:
     """Conflict detection result"""
@@ -103,178 +240,200 @@ class CollisionAvoidanceEngine:
         conflicts = []
         current_time = datetime.now()
         
-        # Convert aircraft list to DataFrame for easier processing
-        aircraft_df = self._prepare_aircraft_data(aircraft_list)
+        # Convert aircraft list to arrays for the numeric passes
+        aircraft_arrays = self._prepare_aircraft_data(aircraft_list)
         
-        if len(aircraft_df) < 2:
+        if len(aircraft_arrays) < 2:
             return conflicts
         
-        # Check all aircraft pairs
-        for i in range(len(aircraft_df)):
-            for j in range(i + 1, len(aircraft_df)):
-                aircraft1 = aircraft_df.iloc[i]
-                aircraft2 = aircraft_df.iloc[j]
-                
-                # Predict trajectories
-                traj1 = self._predict_trajectory(aircraft1, self.prediction_steps)
-                traj2 = self._predict_trajectory(aircraft2, self.prediction_steps)
-                
-                # Check for conflicts
-                conflict = self._check_trajectory_conflict(
-                    aircraft1, aircraft2, traj1, traj2, current_time
-                )
-                
-                if conflict:
-                    conflicts.append(conflict)
-                    self.conflicts_detected += 1
+        # Predict all trajectories at once, shape (N, steps, 3)
+        traj = self._predict_trajectories(aircraft_arrays, self.prediction_steps)
+        
+        # Scan all aircraft pairs for their first loss of separation
+        for i, j, step in self._find_first_conflicts(aircraft_arrays, traj):
+            aircraft1 = aircraft_list[i]
+            aircraft2 = aircraft_list[j]
+            pos1 = traj[i, step]
+            pos2 = traj[j, step]
+            
+            conflict = self._create_conflict(
+                aircraft1, aircraft2, pos1, pos2,
+                self._calculate_horizontal_distance(pos1, pos2), abs(pos1[2] - pos2[2]),
+                step * self.update_interval, current_time
+            )
+            
+            conflicts.append(conflict)
+            self.conflicts_detected += 1
         
         # Sort conflicts by severity and time
-        conflicts.sort(key=lambda x: (x.severity, x.time_to_conflict))
+        conflicts.sort(key=lambda x: (SEV_RANK[x.severity], x.time_to_conflict))
         
         logger.info(f"Detected {len(conflicts)} potential conflicts")
         return conflicts
     
-    def _prepare_aircraft_data(self, aircraft_list: List[Aircraft]) -> pd.DataFrame:
+    def _prepare_aircraft_data(self, aircraft_list: List[Aircraft]) -> AircraftArray:
         """Prepare aircraft data for processing"""
         
-        data = []
-        for aircraft in aircraft_list:
-            data.append({
-                'icao24': aircraft.icao24,
-                'callsign': aircraft.callsign,
-                'latitude': aircraft.latitude,
-                'longitude': aircraft.longitude,
-                'altitude': aircraft.altitude,
-                'velocity': aircraft.velocity,
-                'heading': aircraft.heading,
-                'vertical_rate': aircraft.vertical_rate,
-                'aircraft_type': aircraft.aircraft_type,
-                'priority': aircraft.priority
-            })
-        
-        return pd.DataFrame(data)
-    
-    def _predict_trajectory(self, aircraft: pd.Series, steps: int) -> np.ndarray:
-        """Predict aircraft trajectory"""
-        
-        # Current position
-        lat = aircraft['latitude']
-        lon = aircraft['longitude']
-        alt = aircraft['altitude']
-        vel = aircraft['velocity']  # knots
-        hdg = aircraft['heading']   # degrees
-        vrate = aircraft['vertical_rate']  # feet per minute
-        
-        # Convert to meters per second
-        vel_ms = vel * 0.514444  # knots to m/s
-        vrate_ms = vrate * 0.00508  # ft/min to m/s
-        
-        # Earth radius in meters
-        R = 6371000
-        
-        trajectory = []
-        
-        for step in range(steps):
-            # Time step
-            dt = self.update_interval
+        return AircraftArray.from_aircraft(aircraft_list)
+    
+    def _predict_trajectories(self, aircraft: AircraftArray, steps: int) -> np.ndarray:
+        """Predict all aircraft trajectories as an (N, steps, 3) lat/lon/alt array"""
+        
+        lat0, lon0, alt0 = aircraft.latitude, aircraft.longitude, aircraft.altitude
+        vel_ms = aircraft.velocity * 0.514444  # knots to m/s
+        hdg_rad = aircraft.heading * DEG2RAD
+        vrate_ms = aircraft.vertical_rate * 0.00508  # ft/min to m/s
+        dt = float(self.update_interval)
+        
+        if NUMBA_AVAILABLE:
+            traj = np.empty((len(aircraft), steps, 3))
+            _predict_trajectories_kernel(lat0, lon0, alt0, vel_ms, hdg_rad, vrate_ms, dt, traj)
+            return traj
+        
+        # Per-step increments, accumulated with the same sequential sums as
+        # _predict_trajectory_kernel (row 0 holds the starting position)
+        lat = np.empty((steps + 1, len(aircraft)))
+        lat[0] = lat0
+        lat[1:] = (vel_ms * np.cos(hdg_rad) * dt) / EARTH_R_M * RAD2DEG
+        np.cumsum(lat, axis=0, out=lat)
+        
+        # The longitude step depends on the latitude before each move
+        lon = np.empty_like(lat)
+        lon[0] = lon0
+        lon[1:] = (vel_ms * np.sin(hdg_rad) * dt) / (EARTH_R_M * np.cos(lat[:-1] * DEG2RAD)) * RAD2DEG
+        np.cumsum(lon, axis=0, out=lon)
+        
+        alt = np.empty_like(lat)
+        alt[0] = alt0
+        alt[1:] = vrate_ms * dt
+        np.cumsum(alt, axis=0, out=alt)
+        
+        return np.ascontiguousarray(np.stack((lat[1:], lon[1:], alt[1:]), axis=-1).swapaxes(0, 1))
+    
+    def _find_first_conflicts(self, aircraft: AircraftArray, traj: np.ndarray) -> List[Tuple[int, int, int]]:
+        """Find the first step at which each aircraft pair loses separation"""
+        
+        n, steps = traj.shape[:2]
+        ii, jj = np.triu_indices(n, 1)
+        h_std = self.separation_standards["horizontal"]
+        v_std = self.separation_standards["vertical"]
+        
+        # Skip pairs that cannot close to within separation over the horizon
+        # even flying straight at each other. The first pass uses the wider of
+        # the two airspace standards, so per-pair separations are only looked
+        # up for the pairs that survive it
+        horizon = steps * self.update_interval
+        alt0 = aircraft.altitude
+        vel = aircraft.velocity  # knots
+        vrate = np.abs(aircraft.vertical_rate)  # feet per minute
+        lat0, lon0 = aircraft.latitude, aircraft.longitude
+        h_now = _haversine_nm_array(lat0[ii], lon0[ii], lat0[jj], lon0[jj])
+        h_gap = h_now - (vel[ii] + vel[jj]) * horizon / 3600
+        v_gap = np.abs(alt0[ii] - alt0[jj]) - (vrate[ii] + vrate[jj]) * horizon / 60
+        reachable = ((h_gap < max(h_std["terminal"], h_std["en_route"]))
+                     & (v_gap < max(v_std["terminal"], v_std["en_route"])))
+        ii, jj, h_gap, v_gap = ii[reachable], jj[reachable], h_gap[reachable], v_gap[reachable]
+        
+        # Required separation per pair, by airspace of the mean current altitude
+        terminal = (alt0[ii] + alt0[jj]) / 2 < 10000
+        h_sep = np.where(terminal, h_std["terminal"], h_std["en_route"]).astype(float)
+        v_sep = np.where(terminal, v_std["terminal"], v_std["en_route"]).astype(float)
+        reachable = (h_gap < h_sep) & (v_gap < v_sep)
+        ii, jj, h_sep, v_sep = ii[reachable], jj[reachable], h_sep[reachable], v_sep[reachable]
+        
+        if NUMBA_AVAILABLE:
+            # Largest single-step move of each aircraft, with a little slack for rounding
+            step_nm = _haversine_nm_array(traj[:, :-1, 0], traj[:, :-1, 1],
+                                          traj[:, 1:, 0], traj[:, 1:, 1]).max(axis=1, initial=0.0)
+            step_ft = np.abs(np.diff(traj[:, :, 2], axis=1)).max(axis=1, initial=0.0)
+            step_nm = step_nm * (1 + 1e-9) + 1e-9
+            step_ft = step_ft * (1 + 1e-9) + 1e-9
             
-            # Convert heading to radians
-            hdg_rad = math.radians(hdg)
+            first = np.empty(len(ii), dtype=np.intp)
+            _first_conflict_kernel(traj, ii, jj, h_sep, v_sep, step_nm, step_ft, first)
+            hit = first >= 0
+            return list(zip(ii[hit].tolist(), jj[hit].tolist(), first[hit].tolist()))
+        
+        lat = traj[:, :, 0]
+        lon = traj[:, :, 1]
+        alt = traj[:, :, 2]
+        
+        # Broadcast over (pairs, steps) in blocks of pairs
+        found = []
+        block = max(1, (1 << 20) // steps)
+        for start in range(0, len(ii), block):
+            i, j = ii[start:start + block], jj[start:start + block]
+            h_lim = h_sep[start:start + block, None]
             
-            # Calculate new position
-            # Horizontal movement
-            lat_delta = (vel_ms * math.cos(hdg_rad) * dt) / R
-            lon_delta = (vel_ms * math.sin(hdg_rad) * dt) / (R * math.cos(math.radians(lat)))
+            # Vertical test first, then the flat-earth prefilter on the steps
+            # that pass it, and the haversine on what remains
+            candidate = np.abs(alt[i] - alt[j]) < v_sep[start:start + block, None]
+            p, q = np.nonzero(candidate)
+            lat1, lon1, lat2, lon2 = lat[i[p], q], lon[i[p], q], lat[j[p], q], lon[j[p], q]
             
-            # Vertical movement
-            alt_delta = vrate_ms * dt
+            dphi = (lat2 - lat1) * DEG2RAD
+            dlam = ((lon2 - lon1 + 180.0) % 360.0 - 180.0) * DEG2RAD * np.cos(0.5 * (lat1 + lat2) * DEG2RAD)
+            close = ((EARTH_R_NM * np.sqrt(dphi * dphi + dlam * dlam) < PREFILTER_MARGIN * h_lim[p, 0])
+                     | (np.maximum(np.abs(lat1), np.abs(lat2)) > PREFILTER_MAX_LAT))
+            candidate[p[~close], q[~close]] = False
             
-            # Update position
-            lat += math.degrees(lat_delta)
-            lon += math.degrees(lon_delta)
-            alt += alt_delta
+            p, q = p[close], q[close]
+            candidate[p, q] = _haversine_nm_array(lat1[close], lon1[close], lat2[close], lon2[close]) < h_lim[p, 0]
             
-            trajectory.append([lat, lon, alt])
+            hit = candidate.any(axis=1)
+            first = candidate.argmax(axis=1)
+            found.extend(zip(i[hit].tolist(), j[hit].tolist(), first[hit].tolist()))
         
-        return np.array(trajectory)
+        return found
     
-    def _check_trajectory_conflict(self, aircraft1: pd.Series, aircraft2: pd.Series, 
-                                 traj1: np.ndarray, traj2: np.ndarray, 
-                                 current_time: datetime) -> Optional[Conflict]:
-        """Check if two trajectories have a conflict"""
+    def _create_conflict(self, aircraft1: Aircraft, aircraft2: Aircraft,
+                         pos1: np.ndarray, pos2: np.ndarray, h_dist: float, v_dist: float,
+                         time_to_conflict: float, current_time: datetime) -> Conflict:
+        """Build the conflict record for a detected loss of separation"""
         
-        # Calculate distances at each time step
-        for i, (pos1, pos2) in enumerate(zip(traj1, traj2)):
-            # Calculate horizontal distance
-            h_dist = self._calculate_horizontal_distance(pos1, pos2)
-            
-            # Calculate vertical distance
-            v_dist = abs(pos1[2] - pos2[2])
-            
-            # Time to conflict
-            time_to_conflict = i * self.update_interval
-            
-            # Check separation standards
-            h_separation = self._get_horizontal_separation(aircraft1, aircraft2)
-            v_separation = self._get_vertical_separation(aircraft1, aircraft2)
-            
-            # Check for conflict
-            if h_dist < h_separation and v_dist < v_separation:
-                # Determine conflict type and severity
-                conflict_type = self._determine_conflict_type(h_dist, v_dist, h_separation, v_separation)
-                severity = self._determine_severity(h_dist, v_dist, time_to_conflict)
-                
-                # Generate conflict ID
-                conflict_id = f"CONF_{aircraft1['icao24']}_{aircraft2['icao24']}_{int(current_time.timestamp())}"
-                
-                # Recommend action
-                recommended_action = self._recommend_avoidance_action(
-                    aircraft1, aircraft2, pos1, pos2, severity
-                )
-                
-                # Calculate confidence
-                confidence = self._calculate_confidence(h_dist, v_dist, time_to_conflict)
-                
-                return Conflict(
-                    conflict_id=conflict_id,
-                    aircraft1=aircraft1['icao24'],
-                    aircraft2=aircraft2['icao24'],
-                    conflict_type=conflict_type,
-                    severity=severity,
-                    time_to_conflict=time_to_conflict,
-                    separation_distance=min(h_dist, v_dist),
-                    recommended_action=recommended_action,
-                    confidence=confidence,
-                    timestamp=current_time
-                )
-        
-        return None
-    
-    def _calculate_horizontal_distance(self, pos1: np.ndarray, pos2: np.ndarray) -> float:
-        """Calculate horizontal distance between two positions"""
+        h_separation = self._get_horizontal_separation(aircraft1, aircraft2)
+        v_separation = self._get_vertical_separation(aircraft1, aircraft2)
         
-        # Haversine formula for great circle distance
-        lat1, lon1 = math.radians(pos1[0]), math.radians(pos1[1])
-        lat2, lon2 = math.radians(pos2[0]), math.radians(pos2[1])
+        # Determine conflict type and severity
+        conflict_type = self._determine_conflict_type(h_dist, v_dist, h_separation, v_separation)
+        severity = self._determine_severity(h_dist, v_dist, time_to_conflict)
         
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+        # Generate conflict ID
+        conflict_id = f"CONF_{aircraft1.icao24}_{aircraft2.icao24}_{int(current_time.timestamp())}"
         
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
+        # Recommend action
+        recommended_action = self._recommend_avoidance_action(
+            aircraft1, aircraft2, pos1, pos2, severity
+        )
         
-        # Earth radius in nautical miles
-        R_nm = 3440.065
-        distance_nm = R_nm * c
+        # Calculate confidence
+        confidence = self._calculate_confidence(h_dist, v_dist, time_to_conflict)
+        
+        return Conflict(
+            conflict_id=conflict_id,
+            aircraft1=aircraft1.icao24,
+            aircraft2=aircraft2.icao24,
+            conflict_type=conflict_type,
+            severity=severity,
+            time_to_conflict=time_to_conflict,
+            separation_distance=min(h_dist, v_dist),
+            recommended_action=recommended_action,
+            confidence=confidence,
+            timestamp=current_time
+        )
+    
+    def _calculate_horizontal_distance(self, pos1: np.ndarray, pos2: np.ndarray) -> float:
+        """Calculate horizontal distance between two positions"""
         
-        return distance_nm
+        # Haversine formula for great circle distance
+        return _haversine_nm(float(pos1[0]), float(pos1[1]), float(pos2[0]), float(pos2[1]))
     
-    def _get_horizontal_separation(self, aircraft1: pd.Series, aircraft2: pd.Series) -> float:
+    def _get_horizontal_separation(self, aircraft1: Aircraft, aircraft2: Aircraft) -> float:
         """Get required horizontal separation"""
         
         # Determine airspace type based on altitude
-        alt1 = aircraft1['altitude']
-        alt2 = aircraft2['altitude']
+        alt1 = aircraft1.altitude
+        alt2 = aircraft2.altitude
         avg_alt = (alt1 + alt2) / 2
         
         if avg_alt < 10000:  # Terminal airspace
@@ -282,12 +441,12 @@ class CollisionAvoidanceEngine:
         else:  # En-route airspace
             return self.separation_standards["horizontal"]["en_route"]
     
-    def _get_vertical_separation(self, aircraft1: pd.Series, aircraft2: pd.Series) -> float:
+    def _get_vertical_separation(self, aircraft1: Aircraft, aircraft2: Aircraft) -> float:
         """Get required vertical separation in feet"""
         
         # Determine airspace type based on altitude
-        alt1 = aircraft1['altitude']
-        alt2 = aircraft2['altitude']
+        alt1 = aircraft1.altitude
+        alt2 = aircraft2.altitude
         avg_alt = (alt1 + alt2) / 2
         
         if avg_alt < 10000:  # Terminal airspace
@@ -325,12 +484,12 @@ class CollisionAvoidanceEngine:
         else:
             return "low"
     
-    def _recommend_avoidance_action(self, aircraft1: pd.Series, aircraft2: pd.Series,
+    def _recommend_avoidance_action(self, aircraft1: Aircraft, aircraft2: Aircraft,
                                   pos1: np.ndarray, pos2: np.ndarray, severity: str) -> str:
         """Recommend avoidance action"""
         
         # Priority-based recommendations
-        if aircraft1['priority'] > aircraft2['priority']:
+        if aircraft1.priority > aircraft2.priority:
             primary_aircraft = aircraft1
             secondary_aircraft = aircraft2
         else:
@@ -338,11 +497,11 @@ class CollisionAvoidanceEngine:
             secondary_aircraft = aircraft1
         
         if severity == "critical":
-            return f"IMMEDIATE: {secondary_aircraft['callsign']} turn right 30 degrees, climb 1000 feet"
+            return f"IMMEDIATE: {secondary_aircraft.callsign} turn right 30 degrees, climb 1000 feet"
         elif severity == "high":
-            return f"URGENT: {secondary_aircraft['callsign']} turn right 20 degrees, climb 500 feet"
+            return f"URGENT: {secondary_aircraft.callsign} turn right 20 degrees, climb 500 feet"
         elif severity == "medium":
-            return f"ADVISORY: {secondary_aircraft['callsign']} turn right 15 degrees"
+            return f"ADVISORY: {secondary_aircraft.callsign} turn right 15 degrees"
         else:
             return f"MONITOR: Continue current heading, maintain separation"
     
@@ -362,10 +521,13 @@ class CollisionAvoidanceEngine:
         
         actions = []
         
+        # Index aircraft once; reversed so duplicate icao24s keep the first entry
+        by_icao = {a.icao24: a for a in reversed(aircraft_list)}
+        
         for conflict in conflicts:
             # Find aircraft involved
-            aircraft1 = next((a for a in aircraft_list if a.icao24 == conflict.aircraft1), None)
-            aircraft2 = next((a for a in aircraft_list if a.icao24 == conflict.aircraft2), None)
+            aircraft1 = by_icao.get(conflict.aircraft1)
+            aircraft2 = by_icao.get(conflict.aircraft2)
             
             if not aircraft1 or not aircraft2:
                 continue
@@ -15,6 +15,10 @@ import json
 import requests
 from shapely.geometry import Point, Polygon
 from shapely.ops import unary_union
+try:
+    from shapely import contains_xy
+except ImportError:  # Shapely < 2.0
+    from shapely.vectorized import contains as contains_xy
 import geopandas as gpd
 
 # Configure logging
@@ -70,6 +74,9 @@ class ConflictZoneManager:
         self.conflict_zones: Dict[str, ConflictZone] = {}
         self.flight_restrictions: Dict[str, FlightRestriction] = {}
         
+        # Shapely polygon per zone, keyed by zone id with the geometry it was built from
+        self._poly_cache: Dict[str, Tuple[Dict[str, Any], Optional[Polygon]]] = {}
+        
         # Zone types and their characteristics
         self.zone_types = {
             "warzone": {
@@ -269,42 +276,41 @@ class ConflictZoneManager:
                 continue
             
             # Check if point is within zone geometry
-            if self._point_in_zone(aircraft_lat, aircraft_lon, zone.geometry):
+            if self._point_in_zone(aircraft_lat, aircraft_lon, zone)[0]:
                 conflicting_zones.append(zone)
         
         return conflicting_zones
     
-    def _point_in_zone(self, lat: float, lon: float, geometry: Dict[str, Any]) -> bool:
-        """Check if point is within zone geometry"""
+    def _zone_polygon(self, zone: ConflictZone) -> Optional[Polygon]:
+        """Get the zone's exterior ring as a polygon, built once per geometry"""
+        
+        cached = self._poly_cache.get(zone.zone_id)
+        if cached is not None and cached[0] is zone.geometry:
+            return cached[1]
+        
+        polygon = None
+        if zone.geometry["type"] == "Polygon":
+            polygon = Polygon(zone.geometry["coordinates"][0])  # Exterior ring
+        
+        self._poly_cache[zone.zone_id] = (zone.geometry, polygon)
+        return polygon
+    
+    def _point_in_zone(self, lat, lon, zone: ConflictZone) -> np.ndarray:
+        """Check which points are within zone geometry, for scalar or array lat/lon"""
+        
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
         
         try:
-            if geometry["type"] == "Polygon":
-                coords = geometry["coordinates"][0]  # Exterior ring
-                
-                # Simple point-in-polygon test
-                x, y = lon, lat
-                n = len(coords)
-                inside = False
-                
-                p1x, p1y = coords[0]
-                for i in range(1, n + 1):
-                    p2x, p2y = coords[i % n]
-                    if y > min(p1y, p2y):
-                        if y <= max(p1y, p2y):
-                            if x <= max(p1x, p2x):
-                                if p1y != p2y:
-                                    xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                                if p1x == p2x or x <= xinters:
-                                    inside = not inside
-                    p1x, p1y = p2x, p2y
-                
-                return inside
+            polygon = self._zone_polygon(zone)
+            if polygon is not None:
+                return np.asarray(contains_xy(polygon, lon, lat), dtype=bool)
             
-            return False
+            return np.zeros(lat.shape, dtype=bool)
             
         except Exception as e:
             logger.error(f"Error checking point in zone: {e}")
-            return False
+            return np.zeros(lat.shape, dtype=bool)
     
     def assess_route_impact(self, route_coordinates: List[Tuple[float, float]], 
                           route_altitudes: List[float]) -> RouteImpact:
@@ -378,27 +384,39 @@ class ConflictZoneManager:
         total_delay = 0
         fuel_impact = 0
         
-        # Check multiple points along the segment
+        # Check multiple points along the segment, all at once per zone
         num_points = 10
-        for i in range(num_points + 1):
-            t = i / num_points
-            lat = start_lat + t * (end_lat - start_lat)
-            lon = start_lon + t * (end_lon - start_lon)
-            alt = start_alt + t * (end_alt - start_alt)
+        t = np.arange(num_points + 1) / num_points
+        lats = start_lat + t * (end_lat - start_lat)
+        lons = start_lon + t * (end_lon - start_lon)
+        alts = start_alt + t * (end_alt - start_alt)
+        
+        # Index of the first point inside each zone the segment crosses
+        first_hits = []
+        for zone in self.conflict_zones.values():
+            if zone.status != "active":
+                continue
+            
+            in_range = np.flatnonzero((zone.altitude_min <= alts) & (alts <= zone.altitude_max))
+            if len(in_range) == 0:
+                continue
+            
+            hits = in_range[self._point_in_zone(lats[in_range], lons[in_range], zone)]
+            if len(hits):
+                first_hits.append((hits[0], zone))
+        
+        # Zones in the order the segment enters them
+        first_hits.sort(key=lambda hit: hit[0])
+        for _, zone in first_hits:
+            conflicting_zones.append(zone)
             
-            # Check for conflict zones
-            zones = self.check_aircraft_in_conflict_zone(lat, lon, alt)
-            for zone in zones:
-                if zone not in conflicting_zones:
-                    conflicting_zones.append(zone)
-                    
-                    # Update severity
-                    if zone.severity == "critical":
-                        max_severity = "critical"
-                    elif zone.severity == "high" and max_severity not in ["critical"]:
-                        max_severity = "high"
-                    elif zone.severity == "medium" and max_severity not in ["critical", "high"]:
-                        max_severity = "medium"
+            # Update severity
+            if zone.severity == "critical":
+                max_severity = "critical"
+            elif zone.severity == "high" and max_severity not in ["critical"]:
+                max_severity = "high"
+            elif zone.severity == "medium" and max_severity not in ["critical", "high"]:
+                max_severity = "medium"
         
         # Calculate impact based on severity
         if max_severity == "critical":
@@ -484,6 +502,7 @@ class ConflictZoneManager:
         
         try:
             self.conflict_zones[zone.zone_id] = zone
+            self._poly_cache.pop(zone.zone_id, None)
             logger.info(f"Added conflict zone: {zone.zone_id}")
             return True
         except Exception as e:
@@ -504,6 +523,7 @@ class ConflictZoneManager:
                     setattr(zone, key, value)
             
             zone.last_updated = datetime.now()
+            self._poly_cache.pop(zone_id, None)
             logger.info(f"Updated conflict zone: {zone_id}")
             return True
         except Exception as e:
@@ -519,6 +539,7 @@ class ConflictZoneManager:
         
         try:
             del self.conflict_zones[zone_id]
+            self._poly_cache.pop(zone_id, None)
             logger.info(f"Removed conflict zone: {zone_id}")
             return True
         except Exception as e:
@@ -1,8 +1,3 @@
 """
-Test module for OpenSky API integration
+Test module for OpenSky API integration and core services
 """
-
-from .test_opensky_service import *
-from .test_opensky_config import *
-from .test_opensky_models import *
-from .test_opensky_utils import *
\ No newline at end of file
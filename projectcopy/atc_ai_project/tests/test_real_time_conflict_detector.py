@@ -0,0 +1,97 @@
+"""
+Tests for the real-time conflict detector
+"""
+
+import unittest
+import logging
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.conflict_detection.real_time_conflict_detector import RealTimeConflictDetector, latest_per_aircraft
+
+logging.disable(logging.CRITICAL)
+
+
+def flight(icao24, callsign, latitude, longitude, true_track):
+    """Level flight at 10,000 ft and 230 m/s"""
+    return {
+        'icao24': icao24, 'callsign': callsign, 'latitude': latitude, 'longitude': longitude,
+        'baro_altitude': 10000.0, 'velocity': 230.0, 'true_track': true_track, 'vertical_rate': 0.0
+    }
+
+
+class TestAircraftDeduplication(unittest.TestCase):
+    """Test that only repeated reports of one aircraft are merged"""
+    
+    def setUp(self):
+        self.detector = RealTimeConflictDetector()
+        self.flights = pd.DataFrame([
+            flight('a1', 'UNKNOWN', 40.0, -74.0, 90),
+            flight('a2', 'UNKNOWN', 45.0, -80.0, 0),
+            flight('a3', 'DAL1', 40.0, -73.8, 270),
+        ])
+    
+    def test_placeholder_callsigns_are_distinct_aircraft(self):
+        """Test two unnamed flights are both kept and the converging one is reported"""
+        conflicts = self.detector.detect_conflicts(self.flights)
+        
+        self.assertEqual(len(latest_per_aircraft(self.flights)), 3)
+        self.assertEqual([(c.aircraft_1, c.aircraft_2) for c in conflicts], [('UNKNOWN', 'DAL1')])
+    
+    def test_repeated_cycle_reuses_same_result(self):
+        """Test a second cycle over unchanged flights reports the same conflicts"""
+        first = self.detector.detect_conflicts(self.flights)
+        second = self.detector.detect_conflicts(self.flights)
+        
+        self.assertEqual([(c.aircraft_1, c.aircraft_2, c.separation_distance) for c in first],
+                         [(c.aircraft_1, c.aircraft_2, c.separation_distance) for c in second])
+    
+    def test_latest_report_per_icao24_is_kept(self):
+        """Test an aircraft reported twice keeps only its last report"""
+        flights = pd.concat([self.flights, pd.DataFrame([flight('a3', 'DAL1', 40.0, -73.7, 270)])],
+                            ignore_index=True)
+        
+        latest = latest_per_aircraft(flights)
+        
+        self.assertEqual(latest['icao24'].tolist(), ['a1', 'a2', 'a3'])
+        self.assertEqual(latest['longitude'].tolist()[-1], -73.7)
+    
+    def test_exact_duplicates_without_icao24_are_dropped(self):
+        """Test rows without icao24 collapse only when they repeat exactly"""
+        flights = self.flights.drop(columns='icao24')
+        flights = pd.concat([flights, flights.iloc[[0]]], ignore_index=True)
+        
+        self.assertEqual(len(latest_per_aircraft(flights)), 3)
+        self.assertEqual([sorted((c.aircraft_1, c.aircraft_2)) for c in self.detector.detect_conflicts(flights)],
+                         [['DAL1', 'UNKNOWN']])
+
+
+
+class TestRiskLevels(unittest.TestCase):
+    """Test probability bucketing into risk levels"""
+    
+    def setUp(self):
+        self.detector = RealTimeConflictDetector()
+    
+    def test_default_thresholds(self):
+        """Test probabilities map to the documented levels"""
+        levels = self.detector._determine_risk_level(np.array([0.1, 0.15, 0.5, 0.7, 0.9]))
+        
+        self.assertEqual(levels.tolist(), ['LOW', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])
+        self.assertEqual(self.detector._determine_risk_level(0.9), 'CRITICAL')
+    
+    def test_changed_thresholds_take_effect(self):
+        """Test an update to risk_thresholds after construction is honoured"""
+        self.detector.risk_thresholds['CRITICAL'] = 0.95
+        
+        self.assertEqual(self.detector._determine_risk_level(0.9), 'HIGH')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests for the UnifiedAPIManager result cache
+"""
+
+import unittest
+from unittest.mock import Mock
+import logging
+import pickle
+import tempfile
+import sys
+import os
+from pathlib import Path
+
+import requests
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.api_services.unified_api_manager import UnifiedAPIManager, APIConfig
+
+logging.disable(logging.CRITICAL)
+
+
+class MockResponse:
+    """Mock HTTP response for testing"""
+    
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the disk-backed result cache and its stale fallback"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = UnifiedAPIManager(cache_path=Path(self.tmpdir.name) / "api.sqlite")
+    
+    def tearDown(self):
+        self.manager.close()
+        self.tmpdir.cleanup()
+    
+    def _expire(self, key: str, value):
+        """Store ``value`` under ``key`` as an already expired entry"""
+        self.manager._cache.set(key, pickle.dumps(value), ttl=-1)
+    
+    def _failing_weather_api(self):
+        """Initialize the APIs with a weather key configured and every weather request failing"""
+        self.manager.configure_api("openweathermap", APIConfig(
+            service_name="OpenWeatherMap", enabled=True, api_key="test_key"
+        ))
+        self.manager.initialize_apis()
+        weather_api = self.manager.apis["openweathermap"]
+        weather_api.response_cache = None
+        weather_api.session.get = Mock(side_effect=requests.exceptions.ConnectionError("down"))
+        return weather_api
+    
+    def test_fresh_value_is_cached(self):
+        """Test a successful fetch is stored and reused"""
+        fetch = Mock(return_value={"ok": 1})
+        
+        self.assertEqual(self.manager._cached("k", 60, fetch), {"ok": 1})
+        self.assertEqual(self.manager._cached("k", 60, fetch), {"ok": 1})
+        self.assertEqual(fetch.call_count, 1)
+    
+    def test_stale_value_served_when_fetch_raises(self):
+        """Test an expired entry is served when the upstream fails"""
+        self._expire("k", {"old": 1})
+        fetch = Mock(side_effect=requests.exceptions.ConnectionError("down"))
+        
+        self.assertEqual(self.manager._cached("k", 60, fetch), {"old": 1})
+        fetch.assert_called_once()
+    
+    def test_fetch_error_without_stale_value_raises(self):
+        """Test a failure with nothing cached propagates"""
+        fetch = Mock(side_effect=requests.exceptions.ConnectionError("down"))
+        
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.manager._cached("k", 60, fetch)
+    
+    def test_corrupt_entry_is_evicted_and_refetched(self):
+        """Test an entry that fails to unpickle is replaced by a fresh fetch"""
+        self.manager._cache.set("k", pickle.dumps({"ok": 1})[:-3], ttl=60)
+        fetch = Mock(return_value={"ok": 2})
+        
+        self.assertEqual(self.manager._cached("k", 60, fetch), {"ok": 2})
+        self.assertEqual(pickle.loads(self.manager._cache.get("k")), {"ok": 2})
+        fetch.assert_called_once()
+    
+    def test_corrupt_stale_entry_is_not_served(self):
+        """Test a failing fetch with only a corrupt stale entry raises and evicts it"""
+        self.manager._cache.set("k", b"not a pickle", ttl=-1)
+        fetch = Mock(side_effect=requests.exceptions.ConnectionError("down"))
+        
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.manager._cached("k", 60, fetch)
+        self.assertIsNone(self.manager._cache.get("k", allow_stale=True))
+    
+    def test_opensky_outage_is_not_cached(self):
+        """Test a failed OpenSky request serves the last snapshot and caches nothing"""
+        self.manager.initialize_apis()
+        session = self.manager.apis["opensky"].session
+        session.get = Mock(return_value=MockResponse(b"", status_code=503))
+        key = "states:1:2:3:4"
+        self._expire(key, b'{"states": []}')
+        
+        self.assertEqual(self.manager._fetch_states_payload(1, 2, 3, 4), b'{"states": []}')
+        self.assertIsNone(self.manager._cache.get(key))
+    
+    def test_weather_outage_serves_stale_instead_of_mock(self):
+        """Test a failed weather request serves cached weather, not mock data"""
+        weather_api = self._failing_weather_api()
+        cached = weather_api._get_mock_weather(40.0, -74.0)
+        cached.location = "Cached"
+        self._expire("wx:40.0:-74.0", cached)
+        
+        weather = self.manager.get_weather_at_location(40.0, -74.0)
+        
+        self.assertEqual(weather.location, "Cached")
+        self.assertIsNone(self.manager._cache.get("wx:40.0:-74.0"))
+    
+    def test_weather_outage_without_stale_value_returns_none(self):
+        """Test a failed weather request with nothing cached yields no weather"""
+        self._failing_weather_api()
+        
+        self.assertIsNone(self.manager.get_weather_at_location(40.0, -74.0))
+        self.assertIsNone(self.manager._cache.get("wx:40.0:-74.0", allow_stale=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
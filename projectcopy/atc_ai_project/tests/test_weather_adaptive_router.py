@@ -0,0 +1,65 @@
+"""
+Tests for the weather adaptive router waypoint arrays
+"""
+
+import unittest
+import logging
+from datetime import datetime
+import sys
+import os
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.routing.weather_adaptive_router import WeatherAdaptiveRouter, WaypointArray
+
+logging.disable(logging.CRITICAL)
+
+
+class TestWaypointArrayPrecision(unittest.TestCase):
+    """Test the float32 score columns of WaypointArray"""
+    
+    def setUp(self):
+        self.router = WeatherAdaptiveRouter()
+        rng = np.random.default_rng(0)
+        self.lats = rng.uniform(-60, 60, 2000)
+        self.lons = rng.uniform(-180, 180, 2000)
+    
+    def test_score_columns_are_float32(self):
+        """Test fuel and score columns are allocated as float32 and geometry as float64"""
+        waypoints = WaypointArray.empty(4)
+    
+        for column in (waypoints.fuel, waypoints.impact, waypoints.safety, waypoints.efficiency):
+            self.assertEqual(column.dtype, np.float32)
+        for column in (waypoints.lat, waypoints.lon, waypoints.alt):
+            self.assertEqual(column.dtype, np.float64)
+    
+    def test_impact_mean_survives_downcast(self):
+        """Test the mean weather impact stays within 1e-4 after the float32 downcast"""
+        weather = self.router.weather_manager.get_weather_batch(self.lats, self.lons)
+        impact = self.router._calculate_weather_impact_batch(weather)
+    
+        waypoints = WaypointArray.empty(len(impact))
+        waypoints.impact[:] = impact
+    
+        self.assertEqual(impact.dtype, np.float64)
+        self.assertLess(abs(float(waypoints.impact.mean(dtype=np.float64)) - float(impact.mean())), 1e-4)
+        self.assertLess(abs(float(waypoints.impact.mean()) - float(impact.mean())), 1e-4)
+    
+    def test_route_weather_severity_matches_float64(self):
+        """Test a route's weather severity matches its impacts recomputed in float64"""
+        comparison = self.router.calculate_optimal_routes((40.64, -73.78), (51.47, -0.45),
+                                                          datetime(2025, 1, 1, 12, 0))
+        route = comparison.direct_route
+        waypoints = route.waypoint_array
+    
+        weather = self.router.weather_manager.get_weather_batch(waypoints.lat, waypoints.lon)
+        impact = self.router._calculate_weather_impact_batch(weather)
+    
+        self.assertLess(abs(route.weather_severity - float(impact.mean())), 1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()